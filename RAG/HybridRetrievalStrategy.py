@@ -0,0 +1,40 @@
+from .RetrievalStrategy import RetrievalStrategy
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from .fusion import reciprocal_rank_fusion, score_fusion
+
+
+class HybridRetrievalStrategy(RetrievalStrategy):
+    """
+    Dense vector hits fused with BM25 hits from a local KeywordIndex.
+    Exact terms (languages, tools, company names) that small embedding models blur
+    are caught by the keyword side, without the generation call of RAG fusion.
+    The keyword search runs while the vector search is in flight.
+    """
+    def __init__(self, keyword_index, fusion: str = "rrf", weights: Optional[List[float]] = None,
+                 candidates: int = 20):
+        self.keyword_index = keyword_index
+        # "rrf" fuses on rank only, "score" fuses min-max normalised scores
+        self.fusion = fusion
+        # [dense, keyword], e.g. [1.0, 0.5] to lean on the vectors
+        self.weights = weights
+        # Hits taken from each side before fusing down to k
+        self.candidates = candidates
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-dense")
+
+    def retrieve(self, query: str, vector_db, k: int = 5):
+        dense = self._executor.submit(vector_db.search_batch, [query], max(k, self.candidates))
+        try:
+            keyword_hits = self.keyword_index.search(query, max(k, self.candidates))
+        except Exception as e:
+            print(f"Keyword search failed, using vector hits only: {e}")
+            keyword_hits = []
+        all_hits = [dense.result()[0], keyword_hits]
+
+        if self.fusion == "score":
+            return score_fusion(all_hits, weights=self.weights, top_k=k)
+        return reciprocal_rank_fusion([[payload for payload, score in hits] for hits in all_hits],
+                                      weights=self.weights, top_k=k)
+
+    def get_name(self):
+        return "Hybrid Keyword + Vector"
@@ -1,14 +1,25 @@
 import os
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 from langchain_core.prompts import PromptTemplate
 from huggingface_hub import InferenceClient
 from dotenv import load_dotenv
 from .RetrievalStrategy import RetrievalStrategy
+from .context import ContextBuilder
+from .response_cache import SemanticResponseCache
 
 load_dotenv()
 
 MAX_CHARS_PER_DOC = 5000
 
-def format_docs(docs):
+def format_docs(docs, question: Optional[str] = None, builder: Optional[ContextBuilder] = None,
+                query_vector: Optional[List[float]] = None):
+    """
+    With a question, pack the most relevant passages of each job under the builder's
+    token budget. Without one, fall back to truncating each description.
+    """
+    if question is not None:
+        return (builder or ContextBuilder()).build(docs, question, query_vector)
     formatted = []
     for doc in docs:
         title    = doc.get('title', 'N/A')
@@ -22,14 +33,62 @@ def format_docs(docs):
         formatted.append(f"{title} at {company}, {location}: {content}. Source: {url}")
     return "\n\n".join(formatted)
 
+def completion_deltas(chunks) -> Iterator[str]:
+    """Text deltas of a streamed chat completion, skipping empty and role-only chunks."""
+    for chunk in chunks:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+class StreamingResponse:
+    """
+    Tokens of one answer as the endpoint produces them.
+    Retrieval has already happened when this is returned, so `docs` can be shown
+    before the first token. Iterate once; `text` and `timings` are complete after.
+    Timings are seconds since the query started: retrieve, prompt (both stage ends),
+    first_token and last_token. `cached` answers come whole from the response cache.
+    `on_complete(text)` runs only when the stream was read to the end.
+    """
+    def __init__(self, question: str, docs: List[Dict], deltas: Iterable[str], started: float,
+                 timings: Dict[str, float], cached: bool = False,
+                 on_complete: Optional[Callable[[str], None]] = None):
+        self.question = question
+        self.docs = docs
+        self.timings = timings
+        self.cached = cached
+        self.text = ""
+        self._deltas = deltas
+        self._started = started
+        self._on_complete = on_complete
+
+    def __iter__(self) -> Iterator[str]:
+        parts = []
+        for delta in self._deltas:
+            if "first_token" not in self.timings:
+                self.timings["first_token"] = time.perf_counter() - self._started
+            parts.append(delta)
+            yield delta
+        self.timings["last_token"] = time.perf_counter() - self._started
+        self.text = "".join(parts)
+        if self._on_complete and self.text:
+            self._on_complete(self.text)
+        print("LLM timings: " + ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in self.timings.items()))
+
 class LLMService:
-    def __init__(self, vector_db, strategy: RetrievalStrategy):
+    def __init__(self, vector_db, strategy: RetrievalStrategy, client: Optional[InferenceClient] = None,
+                 context_builder: Optional[ContextBuilder] = None,
+                 response_cache: Optional[SemanticResponseCache] = None):
         self.model_id = "meta-llama/Llama-3.1-8B-Instruct"
         self.vector_db = vector_db
-        self.client = InferenceClient(
-            api_key=os.environ["HF_TOKEN"],
+        # LLM_BASE_URL points the client at any OpenAI-compatible server (e.g. a local TGI),
+        # which may not need a token; the hosted endpoint does
+        base_url = os.getenv("LLM_BASE_URL")
+        self.client = client or InferenceClient(
+            api_key=os.getenv("HF_TOKEN") if base_url else os.environ["HF_TOKEN"],
+            base_url=base_url,
         )
         self.strategy = strategy        
+        self.context_builder = context_builder or ContextBuilder()
+        self.response_cache = response_cache
         self.prompt = PromptTemplate.from_template("""You are a friendly and helpful job search assistant.
 
 Your goal is to help the user find the best job matches based on the provided context. 
@@ -62,38 +121,54 @@ Answer the question based on the above context: {question}
         """Setter function for retrievel strategy"""
         self.strategy = strategy
 
+    def stream_query(self, question: str, max_tokens: int = 2048) -> StreamingResponse:
+        """
+        Retrieve and build the prompt, then open a streaming completion.
+        Raises on retrieval or connection errors; query() wraps them in a message.
+        """
+        started = time.perf_counter()
+        timings = {}
+
+        docs = self.strategy.retrieve(question, self.vector_db)
+        timings["retrieve"] = time.perf_counter() - started
+
+        on_complete = None
+        query_vector = None
+        # An empty retrieval may be a swallowed search error, so its answer is neither served nor stored
+        if self.response_cache is not None and docs:
+            # The vector store already embedded the question for retrieval and cached it
+            query_vector = self.vector_db.embed_query(question)
+            vector = self.response_cache.embed(question, query_vector)
+            docs_key = self.response_cache.make_docs_key(docs)
+            answer = self.response_cache.get(vector, docs_key)
+            timings["cache"] = time.perf_counter() - started
+            if answer is not None:
+                return StreamingResponse(question, docs, [answer], started, timings, cached=True)
+            on_complete = lambda text: self.response_cache.put(question, vector, docs_key, text)
+
+        if self.context_builder.embedder is not None and query_vector is None:
+            query_vector = self.vector_db.embed_query(question)
+        context = format_docs(docs, question, self.context_builder, query_vector)
+        prompt = self.prompt.format(context=context, question=question)
+        timings["prompt"] = time.perf_counter() - started
+
+        chunks = self.client.chat.completions.create(
+            model=self.model_id,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            max_tokens=max_tokens, # Increased to allow for longer descriptions
+            stream=True,
+        )
+        return StreamingResponse(question, docs, completion_deltas(chunks), started, timings,
+                                 on_complete=on_complete)
+
     def query(self, question: str):
         try:
-            docs = self.strategy.retrieve(question, self.vector_db)
-            # Log docs
-            # log_path = os.path.join(os.path.dirname(__file__), '..', 'test', 'logs', 'docs.txt')
-            # with open(log_path, 'w', encoding='utf-8') as f:
-            #     for doc in docs:
-            #         f.write(f"{doc}\n")
-            context = format_docs(docs=docs)
-            # Log context
-            # log_path = os.path.join(os.path.dirname(__file__), '..', 'test', 'logs', 'context.txt')
-            # with open(log_path, 'w', encoding='utf-8') as f:
-            #     f.write(context)
-            prompt = self.prompt.format(context=context, question=question)
-
-            completion = self.client.chat.completions.create(
-                model="meta-llama/Llama-3.1-8B-Instruct",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=2048, # Increased to allow for longer descriptions
-            )
-
-            # Log response
-            # log_path = os.path.join(os.path.dirname(__file__), '..', 'test', 'logs', 'rag.txt')
-            # with open(log_path, 'w', encoding='utf-8') as f:
-            #     f.write(completion.choices[0].message.content)
-
-            return completion.choices[0].message.content
+            return "".join(self.stream_query(question))
         except Exception as e:
             print(f"Query error: {e}")
             return f"Error processing query: {str(e)}"
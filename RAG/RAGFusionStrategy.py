@@ -1,74 +1,176 @@
 from .RetrievalStrategy import RetrievalStrategy
-from huggingface_hub import InferenceClient
+from huggingface_hub import AsyncInferenceClient
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnableLambda
+import asyncio
 import os
-from langchain_core.load import dumps, loads
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .fusion import reciprocal_rank_fusion, score_fusion
 
+QUOTED_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'')
+LINE_PREFIX_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
 
-class RAGFusionStrategy(RetrievalStrategy):
+class QueryStreamParser:
+    """
+    Pull generated search queries out of streamed LLM text as soon as each is complete.
+    Understands a Python/JSON list of strings (an item is complete at its closing
+    quote) and one query per line (complete at the newline), as models do either.
+    """
     def __init__(self):
+        self.buffer = ""
+        self.in_list = False
+
+    def feed(self, text: str) -> List[str]:
+        self.buffer += text
+        return self._drain(final=False)
+
+    def close(self) -> List[str]:
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> List[str]:
+        queries = []
+        while True:
+            if self.in_list:
+                match = QUOTED_RE.search(self.buffer)
+                end = self.buffer.find("]")
+                if match and (end == -1 or match.start() < end):
+                    queries.append(re.sub(r"\\(.)", r"\1", match.group(1) if match.group(1) is not None else match.group(2)))
+                    self.buffer = self.buffer[match.end():]
+                elif end != -1:
+                    self.in_list = False
+                    self.buffer = self.buffer[end + 1:]
+                else:
+                    break
+                continue
+            if self.buffer.lstrip().startswith("["):
+                self.in_list = True
+                self.buffer = self.buffer.lstrip()[1:]
+                continue
+            newline = self.buffer.find("\n")
+            if newline == -1 and not (final and self.buffer.strip()):
+                break
+            line, self.buffer = (self.buffer[:newline], self.buffer[newline + 1:]) if newline != -1 else (self.buffer, "")
+            query = self._clean(line)
+            if query:
+                queries.append(query)
+        return queries
+
+    @staticmethod
+    def _clean(line: str) -> Optional[str]:
+        line = LINE_PREFIX_RE.sub("", line).strip().strip(",").strip().strip("\"'").strip()
+        # Code fences and lead-ins like "Here are 5 queries:" are not queries
+        if not line or line.startswith("```") or line.endswith(":"):
+            return None
+        return line
+
+
+class RAGFusionStrategy(RetrievalStrategy):
+    """
+    Retrieve with the user's query plus LLM-generated variations, fused by rank or score.
+    The plain query is searched immediately, each generated query is searched as soon
+    as it has been streamed, and whatever has arrived by `deadline` seconds is fused;
+    late generations and searches are abandoned.
+    """
+    def __init__(self, fusion: str = "rrf", weights: Optional[List[float]] = None, num_queries: int = 5,
+                 deadline: float = 4.0, client_factory: Optional[Callable[[], AsyncInferenceClient]] = None):
         self.model_id = "meta-llama/Llama-3.1-8B-Instruct"
-        self.client = InferenceClient(
-            api_key=os.environ["HF_TOKEN"],
-        )
-        template = "You are a helpful assistant that generates multiple search queries in multiple perspectives based on input query to retrieve relevant documents from vector database \n Rules: \n - Output ONLY a Python list of 5 strings. \n - Do NOT explain. \n - Do not add headings and markdown. \n Generate exactly 5 search queries related to: {question}" 
+        api_key = os.environ["HF_TOKEN"] if client_factory is None else None
+        # A fresh async client per retrieval: its HTTP session is bound to the event loop
+        self.client_factory = client_factory or (lambda: AsyncInferenceClient(api_key=api_key))
+        template = "You are a helpful assistant that generates multiple search queries in multiple perspectives based on input query to retrieve relevant documents from vector database \n Rules: \n - Output ONLY a Python list of 5 strings. \n - Do NOT explain. \n - Do not add headings and markdown. \n Generate exactly 5 search queries related to: {question}"
         self.rag_fusion_prompt = PromptTemplate.from_template(template)
+        # "rrf" fuses on rank only, "score" fuses normalised similarity scores
+        self.fusion = fusion
+        # Per-list weights in query order (original query first), e.g. [2.0] + [1.0] * 5
+        self.weights = weights
+        self.num_queries = num_queries
+        self.deadline = deadline
+        # Own pool rather than the loop's default one, so asyncio.run does not wait for abandoned searches
+        self._executor = ThreadPoolExecutor(max_workers=num_queries + 1, thread_name_prefix="fusion-search")
 
-    def reciprocal_rank_fusion(self, results: list[list], k=60):
-        fused_scores = {}
+    def reciprocal_rank_fusion(self, results: list[list], k=60, top_k: Optional[int] = None,
+                               weights: Optional[List[float]] = None):
+        """Fuse ranked payload lists by job id (see RAG.fusion)."""
+        return reciprocal_rank_fusion(results, k=k, weights=self.weights if weights is None else weights, top_k=top_k)
 
-        for docs in results:
-            for rank, doc in enumerate(docs):
-                doc = dumps(doc) # convert to JSON string
-                if doc not in fused_scores:
-                    fused_scores[doc] = 0
-                fused_scores[doc] += 1 / (rank + k)
-        
-        reranked_results = [
-            (doc, score) for doc, score in sorted(fused_scores.items(), key=lambda x: x[1], reverse=True) 
-        ]
+    def fuse(self, all_hits: List[List[Tuple[Dict[str, Any], float]]], top_k: int,
+             weights: Optional[List[float]] = None):
+        weights = self.weights if weights is None else weights
+        if self.fusion == "score":
+            return score_fusion(all_hits, weights=weights, top_k=top_k)
+        return self.reciprocal_rank_fusion([[payload for payload, score in hits] for hits in all_hits],
+                                           top_k=top_k, weights=weights)
 
-        return [loads(doc) for doc, score in reranked_results] # convert back to LangChain Document objects
-            
+    def _weight(self, position: int) -> float:
+        return self.weights[position] if self.weights and position < len(self.weights) else 1.0
 
     def retrieve(self, query: str, retriever, k: int = 5):
+        """Blocking entry point; from a running event loop await aretrieve instead."""
+        return asyncio.run(self.aretrieve(query, retriever, k))
 
-        # generated_queries = self.rag_fusion_prompt | self.client | StrOutputParser() | (lambda x: x.split("\n"))
-        # retrieval_chain = generated_queries | retriever.map() | self.reciprocal_rank_fusion()
-        # docs = retrieval_chain.invoke({"question": query})
-
+    async def aretrieve(self, query: str, retriever, k: int = 5):
         print("Run Fusion retrieval")
-        def gen_queries(prompt_value):
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[{"role": "user", "content": prompt_value.to_string()}],
-                max_tokens=200
-            )
-            return response.choices[0].message.content
-
-        query_chain = (
-            self.rag_fusion_prompt 
-            | RunnableLambda(gen_queries) # Call LLM to create queries
-            | StrOutputParser() 
-            | (lambda x: [q.strip() for q in x.split("\n") if q.strip()])
-        )
-        
-        queries = query_chain.invoke({"question": query})
-        
-        if not queries:
-            queries = [query]
-        
-        print("Fusion query:", queries)
-        all_docs = retriever.map().invoke(queries)
-        
-        fused_docs = self.reciprocal_rank_fusion(all_docs)
-        return fused_docs[:k]
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        def search(search_query: str) -> "asyncio.Future":
+            return loop.run_in_executor(self._executor, lambda: retriever.search_batch([search_query], k=k)[0])
+
+        plain = search(query)
+        # Generated query -> (its weight, its search). The weight is fixed by the position the
+        # query was generated at, so a failed or late search does not shift the ones after it
+        searches: Dict[str, Tuple[float, asyncio.Future]] = {}
+
+        def launch(sub_query: str):
+            if sub_query != query and sub_query not in searches and len(searches) < self.num_queries:
+                searches[sub_query] = (self._weight(len(searches) + 1), search(sub_query))
+
+        async def generate():
+            async with self.client_factory() as client:
+                stream = await client.chat.completions.create(
+                    model=self.model_id,
+                    messages=[{"role": "user", "content": self.rag_fusion_prompt.format(question=query)}],
+                    max_tokens=200,
+                    stream=True,
+                )
+                parser = QueryStreamParser()
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    for sub_query in parser.feed(delta or ""):
+                        launch(sub_query)
+                    if len(searches) >= self.num_queries:
+                        return
+                for sub_query in parser.close():
+                    launch(sub_query)
+
+        generation = asyncio.create_task(generate())
+        await asyncio.wait([generation], timeout=self.deadline)
+        if not generation.done():
+            generation.cancel()
+        # Also lets a cancelled generation close its HTTP stream
+        error = (await asyncio.gather(generation, return_exceptions=True))[0]
+        if error is not None and not isinstance(error, asyncio.CancelledError):
+            print(f"Fusion query generation failed, continuing with what arrived: {error}")
+
+        if searches:
+            await asyncio.wait([future for _, future in searches.values()],
+                               timeout=max(0.0, self.deadline - (time.perf_counter() - started)))
+        # The plain search is the baseline and is awaited even past the deadline
+        all_hits = [await plain]
+        weights = [self._weight(0)]
+        for weight, future in searches.values():
+            if future.done() and future.exception() is None:
+                all_hits.append(future.result())
+                weights.append(weight)
+            else:
+                future.cancel()
+
+        print(f"Fusion query: {[query] + list(searches)} "
+              f"({len(all_hits) - 1}/{len(searches)} generated searches fused after {time.perf_counter() - started:.2f}s)")
+        return self.fuse(all_hits, top_k=k, weights=weights)
 
 
     def get_name(self):
         return "RAG Fusion"
-
-    
-    
\ No newline at end of file
@@ -1,5 +1,8 @@
-from .LLMService import LLMService
+from .LLMService import LLMService, StreamingResponse
+from .context import ContextBuilder, TokenCounter
+from .response_cache import SemanticResponseCache
 from .SimpleRetrievalStrategy import SimpleRetrievalStrategy
 from .RAGFusionStrategy import RAGFusionStrategy
+from .HybridRetrievalStrategy import HybridRetrievalStrategy
 
-__all__ = ["LLMService", "SimpleRetrievalStrategy", "RAGFusionStrategy"]
+__all__ = ["LLMService", "StreamingResponse", "ContextBuilder", "TokenCounter", "SemanticResponseCache", "SimpleRetrievalStrategy", "RAGFusionStrategy", "HybridRetrievalStrategy"]
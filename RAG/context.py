@@ -0,0 +1,178 @@
+"""
+Prompt context packing: pick the description sentences of the retrieved jobs that
+answer the question and fit the token budget.
+
+Sentences are scored by term overlap unless ContextBuilder is given an embedder;
+demo.py and the LLMService default keep the lexical scoring.
+"""
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Paragraph breaks in clean_text output are blank lines; single newlines come from inline tags
+BLOCK_SPLIT_RE = re.compile(r"\n\s*\n")
+WHITESPACE_RE = re.compile(r"\s+")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Section headings whose body is company marketing / legal text, not about the job
+BOILERPLATE_HEADING_RE = re.compile(
+    r"^(about (us|the company)|who we are|our (story|mission|values|culture|hiring process)|company description"
+    r"|equal (employment )?opportunit|eeo|diversity|privacy|disclaimer|why join|life at)",
+    re.IGNORECASE,
+)
+BOILERPLATE_SENTENCE_RE = re.compile(
+    r"equal opportunity employer|regardless of (race|age|gender)|reasonable accommodation|privacy (policy|notice)",
+    re.IGNORECASE,
+)
+# Salary is a field of the prompt template, so sentences stating pay are always packed first
+SALARY_RE = re.compile(
+    r"salary|compensation|per (year|annum|month|hour)|[$€£]\s?\d|\d\s?(k|usd|eur|gbp)\b",
+    re.IGNORECASE,
+)
+STOPWORDS = frozenset(
+    "a an and are as at be by find for from in is it jobs job me of on or the to with what who you your".split()
+)
+
+MAX_HEADING_WORDS = 8
+
+@lru_cache(maxsize=4)
+def _load_tokenizer(name: str):
+    # Local cache only: a hub lookup on the request path can block for tens of seconds
+    # offline or for a gated model. Fetch once with `huggingface-cli download <name> tokenizer.json`.
+    try:
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+        return Tokenizer.from_file(hf_hub_download(name, "tokenizer.json", local_files_only=True))
+    except Exception as e:
+        print(f"⚠️ Tokenizer '{name}' not in the local HF cache ({type(e).__name__}), estimating 4 chars per token")
+        return None
+
+class TokenCounter:
+    """
+    Token counts with the generation model's own tokenizer (`tokenizers`), loaded
+    from the local HF cache only. Falls back to a chars/4 estimate at once when it
+    has not been downloaded, instead of waiting on the hub.
+    """
+    def __init__(self, tokenizer_name: Optional[str] = None):
+        self.tokenizer_name = tokenizer_name or os.getenv("LLM_TOKENIZER", "meta-llama/Llama-3.1-8B-Instruct")
+        self.tokenizer = _load_tokenizer(self.tokenizer_name)
+
+    def count(self, text: str) -> int:
+        return self.count_many([text])[0]
+
+    def count_many(self, texts: Sequence[str]) -> List[int]:
+        if self.tokenizer is None:
+            return [math.ceil(len(text) / 4) for text in texts]
+        return [len(encoding.ids) for encoding in self.tokenizer.encode_batch(list(texts), add_special_tokens=False)]
+
+def extract_passages(description: str) -> List[str]:
+    """
+    Split a cleaned description into sentences, dropping headings, boilerplate
+    sections ("About <company>", EEO statements, ...) and very short fragments.
+    A description that is nothing but an "About" section keeps it.
+    """
+    passages, skipped = [], []
+    skipping = False
+    for block in BLOCK_SPLIT_RE.split(description or ""):
+        block = WHITESPACE_RE.sub(" ", block).strip()
+        if not block:
+            continue
+        words = block.split()
+        if len(words) <= MAX_HEADING_WORDS and not block.endswith((".", "!", "?")):
+            # Heading: "About <company>" starts a skipped section, any other heading ends it
+            heading = block.rstrip(":").strip()
+            about_company = heading.lower().startswith("about ") and not re.match(
+                r"about (the |this )?(role|job|position|team|you|opportunity)", heading, re.IGNORECASE)
+            skipping = bool(BOILERPLATE_HEADING_RE.match(heading) or about_company)
+            continue
+        for sentence in SENTENCE_SPLIT_RE.split(block):
+            sentence = sentence.strip()
+            if len(sentence) >= 20 and not BOILERPLATE_SENTENCE_RE.search(sentence):
+                (skipped if skipping else passages).append(sentence)
+    return passages or skipped
+
+class ContextBuilder:
+    """
+    Pack retrieved jobs into a prompt context under a token budget.
+    Every job keeps the fields the prompt asks for (title, company, location, URL).
+    Description sentences are scored against the question by term overlap, or by
+    cosine similarity of embeddings when an embedder is given. The question's vector
+    can be passed in (LLMService reuses the one retrieval cached, which must come from
+    the same model), but every candidate sentence is still embedded before generation,
+    so only pass a local or cached embedder (CachedEmbedder) where the extra latency
+    is acceptable. Salary
+    sentences get a boost. The budget is then filled greedily: first the best
+    sentence of each job in rank order, then the best remaining sentences of any
+    job. Chosen sentences are emitted in their original order.
+    """
+    def __init__(self, embedder=None, token_budget: int = 2000, counter: Optional[TokenCounter] = None,
+                 salary_boost: float = 1.0, rank_decay: float = 0.05):
+        self.embedder = embedder
+        self.token_budget = token_budget
+        self.counter = counter or TokenCounter()
+        self.salary_boost = salary_boost
+        self.rank_decay = rank_decay
+
+    def _score(self, question: str, passages: List[str], query_vector: Optional[Sequence[float]] = None) -> np.ndarray:
+        if not passages:
+            return np.zeros(0)
+        if self.embedder is not None:
+            vectors = np.asarray(self.embedder.embed_documents(passages), dtype=np.float32)
+            # A vector from another model cannot be compared; embed the question here instead
+            if query_vector is None or len(query_vector) != vectors.shape[1]:
+                query_vector = self.embedder.embed_query(question)
+            query = np.asarray(query_vector, dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(query) or 1.0)
+            return vectors @ query / np.where(norms == 0, 1.0, norms)
+        terms = set(WORD_RE.findall(question.lower())) - STOPWORDS
+        scores = []
+        for passage in passages:
+            words = set(WORD_RE.findall(passage.lower()))
+            scores.append(len(terms & words) / math.sqrt(len(words)) if words else 0.0)
+        return np.asarray(scores)
+
+    def build(self, docs: List[Dict], question: str, query_vector: Optional[Sequence[float]] = None) -> str:
+        headers, sources, doc_passages = [], [], []
+        for doc in docs:
+            headers.append(f"{doc.get('title', 'N/A')} at {doc.get('company', 'N/A')}, {doc.get('location', 'N/A')}")
+            sources.append(f"Source: {doc.get('url', 'N/A')}")
+            doc_passages.append(extract_passages(doc.get('description') or ''))
+
+        # (doc index, passage index) for every sentence, scored in one embedding call
+        flat: List[Tuple[int, int]] = [(d, p) for d, passages in enumerate(doc_passages) for p in range(len(passages))]
+        texts = [doc_passages[d][p] for d, p in flat]
+        scores = self._score(question, texts, query_vector)
+        costs = self.counter.count_many(texts) if texts else []
+        fixed = sum(self.counter.count_many([f"{h}: . {s}" for h, s in zip(headers, sources)])) if docs else 0
+
+        ranked = []
+        for (d, p), score, cost in zip(flat, scores, costs):
+            if SALARY_RE.search(doc_passages[d][p]):
+                score += self.salary_boost
+            ranked.append((score * (1 - self.rank_decay * d), d, p, cost))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+
+        remaining = self.token_budget - fixed
+        chosen = set()
+        # Pass 1: the best sentence of every job, so no job is reduced to its header
+        for d in range(len(docs)):
+            best = next((item for item in ranked if item[1] == d), None)
+            if best and best[3] <= remaining:
+                chosen.add((d, best[2]))
+                remaining -= best[3]
+        # Pass 2: best remaining sentences across all jobs while they fit
+        for _, d, p, cost in ranked:
+            if (d, p) not in chosen and cost <= remaining:
+                chosen.add((d, p))
+                remaining -= cost
+
+        formatted = []
+        for d, (header, source) in enumerate(zip(headers, sources)):
+            content = " ".join(passage for p, passage in enumerate(doc_passages[d]) if (d, p) in chosen)
+            formatted.append(f"{header}: {content} {source}")
+        return "\n\n".join(formatted)
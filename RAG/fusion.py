@@ -0,0 +1,63 @@
+import heapq
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+Payload = Dict[str, Any]
+
+def doc_key(doc: Payload, id_key: str = "id") -> Hashable:
+    """Stable identity of a hit: the sha256 job id, falling back to the URL."""
+    return doc.get(id_key) or doc.get("url") or id(doc)
+
+def _top(scores: Dict[Hashable, float], docs: Dict[Hashable, Payload], top_k: Optional[int]) -> List[Payload]:
+    # nlargest/sorted are stable, so ties keep first-seen order and results are deterministic
+    if top_k is not None:
+        ranked = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+    else:
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [docs[key] for key, score in ranked]
+
+def reciprocal_rank_fusion(results: Sequence[Sequence[Payload]], k: int = 60,
+                           weights: Optional[Sequence[float]] = None, top_k: Optional[int] = None,
+                           id_key: str = "id") -> List[Payload]:
+    """
+    Weighted RRF over ranked payload lists: score(d) = sum_i w_i / (k + rank_i(d)).
+    Documents are keyed by id, so payloads are returned as-is without re-serializing.
+    """
+    scores: Dict[Hashable, float] = {}
+    docs: Dict[Hashable, Payload] = {}
+
+    for list_index, ranked_docs in enumerate(results):
+        weight = weights[list_index] if weights and list_index < len(weights) else 1.0
+        for rank, doc in enumerate(ranked_docs):
+            key = doc_key(doc, id_key)
+            if key not in docs:
+                docs[key] = doc
+                scores[key] = 0.0
+            scores[key] += weight / (rank + k)
+
+    return _top(scores, docs, top_k)
+
+def score_fusion(results: Sequence[Sequence[Tuple[Payload, float]]],
+                 weights: Optional[Sequence[float]] = None, top_k: Optional[int] = None,
+                 id_key: str = "id") -> List[Payload]:
+    """
+    Weighted CombSUM over (payload, score) lists. Scores are min-max normalised
+    per list so similarity scales from different queries are comparable.
+    """
+    scores: Dict[Hashable, float] = {}
+    docs: Dict[Hashable, Payload] = {}
+
+    for list_index, hits in enumerate(results):
+        if not hits:
+            continue
+        weight = weights[list_index] if weights and list_index < len(weights) else 1.0
+        hit_scores = [score for _, score in hits]
+        low, high = min(hit_scores), max(hit_scores)
+        spread = (high - low) or 1.0
+        for doc, score in hits:
+            key = doc_key(doc, id_key)
+            if key not in docs:
+                docs[key] = doc
+                scores[key] = 0.0
+            scores[key] += weight * (score - low) / spread
+
+    return _top(scores, docs, top_k)
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .fusion import doc_key
+
+class SemanticResponseCache:
+    """
+    Persistent cache of generated answers keyed on query meaning.
+    Stores (query embedding, retrieved doc ids, answer) in SQLite, so every
+    Streamlit session and process on the host shares it. An answer is served
+    when a new query's embedding is within `threshold` cosine similarity of a
+    cached query AND retrieval returned the same set of jobs, so new or removed
+    postings always trigger a fresh generation. Entries expire after `ttl`
+    seconds; least recently used entries are evicted beyond `max_entries`.
+    `embedder` must match the vector store's model: LLMService reuses the
+    question vector computed for retrieval instead of embedding it again.
+    """
+    def __init__(self, embedder, path: str = './data/response_cache.db', threshold: float = 0.95,
+                 ttl: Optional[float] = 6 * 3600, max_entries: int = 10_000):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.embedder = embedder
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Streamlit serves sessions from a thread pool, so share one connection behind a lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                docs_key TEXT NOT NULL,
+                question TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_docs_key ON responses(docs_key);
+            CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+        ''')
+        self.conn.commit()
+
+    def make_docs_key(self, docs: Iterable[Dict]) -> str:
+        """Order-insensitive key of the retrieved job ids, scoped to the embedding model."""
+        ids = sorted(str(doc_key(doc)) for doc in docs)
+        model_id = getattr(self.embedder, "model_id", "")
+        return hashlib.sha256("\n".join([model_id] + ids).encode("utf-8")).hexdigest()
+
+    def embed(self, question: str, vector: Optional[List[float]] = None) -> np.ndarray:
+        """Normalised question embedding; pass `vector` when retrieval already computed it."""
+        if vector is None:
+            vector = self.embedder.embed_query(question)
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, vector: np.ndarray, docs_key: str) -> Optional[str]:
+        """Answer of the most similar cached query with the same retrieved jobs, if close enough."""
+        now = time.time()
+        with self._lock, self.conn:
+            rows = self.conn.execute(
+                "SELECT id, embedding, answer FROM responses WHERE docs_key = ? AND created_at > ?",
+                (docs_key, now - self.ttl if self.ttl else 0)
+            ).fetchall()
+            best: Optional[Tuple[float, int, str]] = None
+            for entry_id, blob, answer in rows:
+                cached = np.frombuffer(blob, dtype=np.float32)
+                if cached.shape != vector.shape:
+                    continue
+                similarity = float(cached @ vector)
+                if similarity >= self.threshold and (best is None or similarity > best[0]):
+                    best = (similarity, entry_id, answer)
+            if best is None:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE id = ?", (now, best[1]))
+            self.hits += 1
+            return best[2]
+
+    def put(self, question: str, vector: np.ndarray, docs_key: str, answer: str):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                '''
+                INSERT INTO responses (docs_key, question, embedding, answer, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''',
+                (docs_key, question, np.asarray(vector, dtype=np.float32).tobytes(), answer, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        if self.ttl:
+            self.conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+        size = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = size - self.max_entries
+        if overflow > 0:
+            self.conn.execute(
+                '''
+                DELETE FROM responses WHERE id IN (
+                    SELECT id FROM responses ORDER BY last_used LIMIT ?
+                )
+                ''',
+                (overflow,)
+            )
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            size = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": size,
+            "max_entries": self.max_entries,
+        }
+
+    def close(self):
+        self.conn.close()
@@ -1,8 +1,51 @@
-from models import Job
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from models import Job, JobRecord
 from datetime import datetime
 from services.JobClassificationService import classify_category
 from utils import clean_text
 
+@dataclass
+class TransformResult:
+    """Outcome of a batch transform, in input order."""
+    jobs: List[JobRecord] = field(default_factory=list)
+    skipped: List[int] = field(default_factory=list)               # inputs without position/company
+    errors: List[Tuple[int, str]] = field(default_factory=list)    # (input index, error message)
+    elapsed: float = 0.0
+    processes: int = 1
+
+    @property
+    def jobs_per_second(self) -> float:
+        total = len(self.jobs) + len(self.skipped) + len(self.errors)
+        return total / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other: "TransformResult", offset: int = 0):
+        """Append another result whose input indices start at `offset` in this one."""
+        self.jobs.extend(other.jobs)
+        self.skipped.extend(index + offset for index in other.skipped)
+        self.errors.extend((index + offset, error) for index, error in other.errors)
+
+def _transform_chunk(chunk: List[dict], offset: int) -> TransformResult:
+    """
+    Process-pool worker: transform one chunk, bucketing skips and errors by input index.
+    Jobs are validated here once and shipped back as compact JobRecords.
+    """
+    result = TransformResult()
+    for index, raw_job in enumerate(chunk, start=offset):
+        try:
+            job = RemoteOKAdapter.transform(raw_job)
+        except Exception as e:
+            result.errors.append((index, f"{type(e).__name__}: {e}"))
+            continue
+        if job is None:
+            result.skipped.append(index)
+        else:
+            result.jobs.append(JobRecord.from_job(job))
+    return result
+
 class RemoteOKAdapter:
     @staticmethod
     def transform(raw_job: dict) -> Job:
@@ -21,4 +64,43 @@ class RemoteOKAdapter:
             posted_date=raw_job.get('date'),
             scraped_at=datetime.now(),
             category=classify_category(raw_job.get('position'), cleaned_description)
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def transform_batch(raw_jobs: List[dict], processes: Optional[int] = None, chunksize: int = 64) -> TransformResult:
+        """
+        Transform raw jobs across a process pool in chunks of `chunksize`.
+        HTML cleaning, keyword classification and validation are CPU-bound, so this
+        scales with cores. Output keeps input order; processes=1 runs in-process.
+        """
+        started = time.perf_counter()
+        chunks = [(raw_jobs[i:i + chunksize], i) for i in range(0, len(raw_jobs), chunksize)]
+
+        processes = processes or multiprocessing.cpu_count()
+        # Daemonic processes (e.g. some Celery workers) cannot start a pool
+        if processes == 1 or len(chunks) <= 1 or multiprocessing.current_process().daemon:
+            processes = 1
+            partials = [_transform_chunk(chunk, offset) for chunk, offset in chunks]
+        else:
+            processes = min(processes, len(chunks))
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                partials = list(pool.map(_transform_chunk, *zip(*chunks)))
+
+        result = TransformResult(processes=processes)
+        for partial in partials:
+            result.merge(partial)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def refine_categories(jobs: List[JobRecord], classifier=None) -> List[JobRecord]:
+        """
+        Relabel a batch with a fitted CentroidClassifier in one embedding call.
+        The keyword category set by transform() is kept when confidence is low.
+        """
+        if classifier is None or not jobs:
+            return jobs
+        categories = classifier.classify_jobs([job.to_dict() for job in jobs])
+        for job, category in zip(jobs, categories):
+            job.category = category
+        return jobs
@@ -1,7 +1,6 @@
 import os
 import sys
 import pendulum
-import json
 from datetime import datetime, timedelta
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -9,11 +8,16 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from airflow.decorators import dag, task
-from scraper.remoteOK import RemoteOKScraper
+from scraper.pipeline import run_ingest
 from adapters.remoteOK_adapter import RemoteOKAdapter
 from database import Database
 from services.embedding_service import EmbeddingService
 from services.vector_db import ChromaService
+from services.embedders import get_embedder
+from services.CentroidClassifier import CentroidClassifier
+from services.NearDuplicateDetector import NearDuplicateDetector
+from services.export_service import ExportService
+from services.KeywordIndex import KeywordIndex
 
 default_args = {
     'owner': 'jobpulse',
@@ -25,6 +29,16 @@ default_args = {
 }
 
 TEST_DATABASE = '/opt/airflow/data/jobpulse-with-category.db'
+EMBEDDING_CACHE_PATH = '/opt/airflow/data/embedding_cache.db'
+CATEGORY_CENTROIDS_PATH = '/opt/airflow/data/category_centroids.npz'
+SCRAPER_STATE_PATH = '/opt/airflow/data/remoteok_scraper_state.json'
+EXPORT_DIR = '/opt/airflow/data/exports'
+# BM25 side of HybridRetrievalStrategy for the Chroma store synced below (one index per vector store)
+KEYWORD_INDEX_PATH = '/opt/airflow/data/keyword_index_chroma.db'
+JOB_SOURCES = [name.strip() for name in os.getenv('JOB_SOURCES', 'remoteok').split(',') if name.strip()]
+EMBED_CHUNK_SIZE = 64
+EMBED_CONCURRENCY = int(os.getenv('EMBED_CONCURRENCY', '4'))
+EMBED_REQUESTS_PER_SECOND = float(os.getenv('EMBED_REQUESTS_PER_SECOND', '0')) or None
 
 @dag(
     dag_id='daily_job_scraper',
@@ -41,50 +55,77 @@ def daily_job_scraper_dag():
         """
         Fetch and store jobs from remoteOK
         """
-        print("Starting RemoteOK scrape...")
-        scraper = RemoteOKScraper()
-        raw_jobs = scraper.scrape_jobs()
+        print(f"Starting scrape of {', '.join(JOB_SOURCES)}...")
+        # All boards are fetched concurrently; each page is transformed as soon as it arrives.
+        # RemoteOK is incremental: conditional request + seen-id filter.
+        results = run_ingest(
+            JOB_SOURCES,
+            scraper_kwargs={'remoteok': {'state_path': SCRAPER_STATE_PATH}}
+        )
+
+        # Let Airflow retry when no board could be scraped at all
+        if all(result.error for result in results.values()):
+            raise RuntimeError(f"All job sources failed: { {name: r.error for name, r in results.items()} }")
+
+        db = Database(TEST_DATABASE, performance=True)
+
+        # Near-duplicate index lives in the same DB; the backfill only touches unindexed rows
+        detector = NearDuplicateDetector(db)
+        backfill = detector.backfill()
+        if backfill["indexed"] or backfill["duplicates"]:
+            print(f"Indexed {backfill['indexed']} stored jobs for near-duplicate detection "
+                  f"({backfill['duplicates']} existing near-duplicates excluded from embedding)")
+
+        # Relabel with embedding centroids when they have been fitted (scripts/recategorize.py)
+        classifier = None
+        if os.path.exists(CATEGORY_CENTROIDS_PATH):
+            classifier = CentroidClassifier.load(
+                CATEGORY_CENTROIDS_PATH,
+                embedder=get_embedder(cache_path=EMBEDDING_CACHE_PATH)
+            )
 
-        print(f"Fetched {len(raw_jobs)} raw jobs from RemoteOK")
-
-        db = Database(TEST_DATABASE)
         success_count = 0
-
-        for job in raw_jobs:
-            try:
-                standard_job = RemoteOKAdapter.transform(job)
-                if standard_job is None:
-                    continue
-
-                if db.insert_job(standard_job):
-                    success_count += 1
-            except Exception as e:
-                print(f"Error processing job:", e)
-                continue
-
-        print(f"Successfully stored {success_count}/{len(raw_jobs)} RemoteOK jobs")
-
-        # Export ALL jobs from SQLite to jobs.json for Streamlit seeding
+        for name, result in results.items():
+            transform_result = result.transform
+            standard_jobs = transform_result.jobs
+            for index, error in transform_result.errors:
+                print(f"[{name}] Error processing job {index}: {error}")
+            print(f"[{name}] Transformed {len(standard_jobs)}/{result.raw_jobs} new raw jobs "
+                  f"({len(transform_result.skipped)} skipped, {len(transform_result.errors)} failed)")
+
+            # Reposts and cross-source copies collapse onto their canonical job and are never
+            # stored or embedded again
+            dedup_result = detector.deduplicate(standard_jobs)
+
+            # Only jobs that will be stored are embedded for classification
+            RemoteOKAdapter.refine_categories(dedup_result.unique, classifier)
+
+            # Single transaction per source instead of one commit per job
+            insert_result = db.insert_jobs_bulk(dedup_result.unique)
+            detector.index(dedup_result)
+            success_count += insert_result["inserted"]
+            print(f"[{name}] Successfully stored {insert_result['inserted']}/{len(standard_jobs)} jobs "
+                  f"({insert_result['ignored']} already stored, "
+                  f"{len(dedup_result.duplicates)} near-duplicates collapsed)")
+
+            # Only remember the feed position once its jobs are safely stored
+            if result.error is None and hasattr(result.scraper, 'commit_state'):
+                result.scraper.commit_state()
+
+        # Stream the jobs table to the Streamlit seed file (same JSON array as before, written
+        # row by row and renamed into place) and write an incremental NDJSON change file
         try:
+            exporter = ExportService(db)
             root_json_path = os.path.join(project_root, 'jobs-with-category.json')
-            print(f"Exporting to: {root_json_path}")
-
-            # Get all jobs from database (returns list of dicts)
-            all_jobs = db.get_all_jobs()
-            print(f"Total jobs in SQLite: {len(all_jobs)}")
-
-            # Convert datetime objects to ISO format strings for JSON serialization
-            for job in all_jobs:
-                if job.get('posted_date') and hasattr(job['posted_date'], 'isoformat'):
-                    job['posted_date'] = job['posted_date'].isoformat()
-                if job.get('scraped_at') and hasattr(job['scraped_at'], 'isoformat'):
-                    job['scraped_at'] = job['scraped_at'].isoformat()
-                if job.get('embedded_at') and hasattr(job['embedded_at'], 'isoformat'):
-                    job['embedded_at'] = job['embedded_at'].isoformat()
-
-            with open(root_json_path, 'w') as f:
-                json.dump(all_jobs, f)
-            print(f"Successfully exported {len(all_jobs)} jobs to {root_json_path}")
+            snapshot = exporter.export(root_json_path)
+            print(f"Exported {snapshot['rows']} jobs to {root_json_path} in {snapshot['elapsed']:.2f}s")
+
+            changes = exporter.export_incremental('jobs', EXPORT_DIR)
+            if changes['path']:
+                print(f"Exported {changes['rows']} changed jobs to {changes['path']} "
+                      f"(watermark {changes['watermark']})")
+            else:
+                print("No job changes since the last incremental export")
         except Exception as e:
             import traceback
             print(f"JSON export failed: {e}")
@@ -94,11 +135,26 @@ def daily_job_scraper_dag():
 
     @task()
     def sync_embedding():
-        db = Database(TEST_DATABASE)
-        vector_db = ChromaService()
-        service = EmbeddingService(db, vector_db)
-
-        result = service.sync_embeddings(batch_size=None)
+        db = Database(TEST_DATABASE, performance=True)
+        embedder = get_embedder(cache_path=EMBEDDING_CACHE_PATH)
+        vector_db = ChromaService(embedder=embedder)
+        keyword_index = KeywordIndex(KEYWORD_INDEX_PATH)
+        # Catches up jobs embedded before the index existed; skipped once the index is level
+        backfilled = keyword_index.backfill(db)
+        if backfilled:
+            print(f"Keyword index backfilled with {backfilled} embedded jobs")
+        service = EmbeddingService(db, vector_db, keyword_index=keyword_index)
+
+        # Stream the backlog in fixed-size chunks, embedding several chunks in parallel
+        # while the previous ones are written to the vector store
+        result = service.sync_embeddings_pipelined(
+            chunk_size=EMBED_CHUNK_SIZE,
+            concurrency=EMBED_CONCURRENCY,
+            requests_per_second=EMBED_REQUESTS_PER_SECOND
+        )
+        if hasattr(embedder, 'stats'):
+            print(f"Embedding cache: {embedder.stats()}")
+        print(f"Keyword index: {keyword_index.stats()}")
 
         return result
 
@@ -14,13 +14,14 @@ from datetime import timedelta
 from airflow.sdk import dag, task
 from langchain_huggingface import HuggingFaceEndpointEmbeddings
 import pendulum
-import hashlib
 from services.vector_db.QdrantService import QdrantService
+from services.embedders import get_embedder
 from services.BigQueryService import BigQueryService
+from services.KeywordIndex import KeywordIndex
+from services.parquet_export import JOBS_SCHEMA_FIELDS, upload_parquet_parts
 from adapters.remoteOK_adapter import RemoteOKAdapter
 from database import Database
 from scraper.remoteOK import RemoteOKScraper
-import json
 from datetime import date
 import logging
 
@@ -34,6 +35,8 @@ default_args = {
 }
 
 GCS_BUCKET_NAME = f"jobpulse-data-lake-v1"
+# BM25 side of HybridRetrievalStrategy for Qdrant's job_collection; the Chroma DAG keeps its own
+KEYWORD_INDEX_PATH = '/opt/airflow/data/keyword_index_qdrant.db'
 
 
 @dag(
@@ -69,36 +72,27 @@ def local_to_GCS_bucket_dag():
         """
         logger = logging.getLogger("airflow.task")
         
-        jobs_list = []
-        success_count = 0
-
-        for job in raw_jobs:
-            try:
-                standard_job = RemoteOKAdapter.transform(job)
-                if standard_job is not None:
-                    job_dict = standard_job.model_dump(mode='json')
-                    job_dict['id'] = hashlib.sha256(standard_job.description.encode("utf-8")).hexdigest()
-                    jobs_list.append(job_dict)
-                    success_count += 1
-            except Exception as e:
-                logger.warning(f"Error processing job: {e}")
-                continue
-        
-        # Convert list of dicts to newline-delimited JSON string
-        ndjson_data = "\n".join([json.dumps(record) for record in jobs_list])
-        
-        upload_path = f'raw/{date.today()}/jobs.json'
+        # CPU-bound cleaning/classification fanned out over the worker's cores
+        transform_result = RemoteOKAdapter.transform_batch(raw_jobs)
+        for index, error in transform_result.errors:
+            logger.warning(f"Error processing job {index}: {error}")
+        logger.info(f"Transformed {len(transform_result.jobs)} jobs in {transform_result.elapsed:.2f}s "
+                    f"on {transform_result.processes} processes "
+                    f"({len(transform_result.skipped)} skipped, {len(transform_result.errors)} failed)")
+
+        # Stream records into zstd Parquet parts with the staging schema; each part is
+        # uploaded in resumable chunks as soon as it is written
         hook = GCSHook(gcp_conn_id="google_cloud_default")
-        
-        logger.info(f"Uploading {success_count} jobs to gs://{GCS_BUCKET_NAME}/{upload_path}")
-        hook.upload(
+        object_names = upload_parquet_parts(
+            transform_result.jobs,
+            hook=hook,
             bucket_name=GCS_BUCKET_NAME,
-            object_name=upload_path,
-            data=ndjson_data,
-            encoding='utf-8'
+            prefix=f'raw/{date.today()}/jobs'
         )
-        
-        return upload_path
+        logger.info(f"Uploaded {len(transform_result.jobs)} jobs to gs://{GCS_BUCKET_NAME} "
+                    f"as {len(object_names)} Parquet part(s)")
+
+        return object_names
 
     # Execute tasks and pass data via XCom
     raw_data = scrape_remoteOK()
@@ -107,25 +101,13 @@ def local_to_GCS_bucket_dag():
     load_to_staging = GCSToBigQueryOperator(
         task_id="load_to_staging",
         bucket=GCS_BUCKET_NAME,
-        source_objects=[upload_task],
+        source_objects=upload_task,
         destination_project_dataset_table="jobpulse-492611.jobpulse.jobs_staging",
-        source_format="NEWLINE_DELIMITED_JSON", 
+        source_format="PARQUET",
         write_disposition="WRITE_TRUNCATE",
         create_disposition="CREATE_IF_NEEDED",
         gcp_conn_id="google_cloud_default",
-        schema_fields=[
-            {"name": "id", "type": "STRING", "mode": "REQUIRED"},
-            {"name": "title", "type": "STRING", "mode": "REQUIRED"},
-            {"name": "company", "type": "STRING", "mode": "REQUIRED"},
-            {"name": "description", "type": "STRING", "mode": "NULLABLE"},
-            {"name": "url", "type": "STRING", "mode": "REQUIRED"},
-            {"name": "location", "type": "STRING", "mode": "NULLABLE"},
-            {"name": "posted_date", "type": "TIMESTAMP", "mode": "NULLABLE"},
-            {"name": "scraped_at", "type": "TIMESTAMP", "mode": "REQUIRED"},
-            {"name": "has_embedded", "type": "BOOLEAN", "mode": "NULLABLE"},
-            {"name": "embedded_at", "type": "TIMESTAMP", "mode": "NULLABLE"},
-            {"name": "category", "type": "STRING", "mode": "NULLABLE"},
-        ],
+        schema_fields=JOBS_SCHEMA_FIELDS,
     )
 
     # Prepare to merge with final BigQuery table
@@ -157,7 +139,9 @@ def local_to_GCS_bucket_dag():
         qdrant_service = QdrantService(
             API_KEY=QDRANT_API_KEY, 
             url=QDRANT_ENDPOINT, 
-            local=QDRANT_LOCAL_MODE
+            local=QDRANT_LOCAL_MODE,
+            # Cache makes retries after a failed status update free of inference calls
+            embedder=get_embedder(cache_path='/opt/airflow/data/embedding_cache.db')
         )
 
         service = BigQueryService(hook=BigQueryHook(gcp_conn_id='google_cloud_default'))
@@ -167,6 +151,8 @@ def local_to_GCS_bucket_dag():
             return []
 
         job_ids = qdrant_service.add_jobs(jobs)
+        upserted = set(job_ids)
+        KeywordIndex(KEYWORD_INDEX_PATH).add_jobs([job for job in jobs if job['id'] in upserted])
         
         # Return only IDs that were successfully processed
         return job_ids
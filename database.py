@@ -1,16 +1,45 @@
 import sqlite3
-from models import Job
+from models import Job, JobRecord, generate_job_id
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 import os
-import hashlib
+
+def job_to_row(job: Union[Job, JobRecord]) -> Tuple:
+    """Map a Job (or an already converted JobRecord) to the INSERT column order."""
+    if isinstance(job, JobRecord):
+        return job.to_row()
+    return (
+        generate_job_id(job.description),
+        job.title,
+        job.company,
+        job.description,
+        str(job.url),
+        job.location,
+        job.posted_date.isoformat() if job.posted_date else None,
+        job.scraped_at.isoformat(),
+        job.category
+    )
+
+# Opt-in connection profile for concurrent scraper + embedding sync tasks.
+# WAL lets readers run alongside the writer, NORMAL sync is durable in WAL mode
+# without an fsync per commit, and cache/mmap keep the hot pages in memory.
+PERFORMANCE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,       # negative = KiB, ~64 MB page cache
+    "mmap_size": 268435456,     # 256 MB
+    "temp_store": "MEMORY",
+}
+
+# Stay below SQLite's default host-parameter limit (999 before 3.32) per statement
+SQLITE_MAX_VARIABLES = 900
 
 class Database:
-    def __init__(self, db_path='/opt/airflow/data/jobpulse.db'):
+    def __init__(self, db_path='/opt/airflow/data/jobpulse.db', performance: bool = False):
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
-        self.create_tables()
+        self.db_path = db_path
+        self.performance = performance
+        self._connect()
 
 
     def create_tables(self):
@@ -29,86 +58,190 @@ class Database:
                 category TEXT
             )
         ''')
-        
+        # IF NOT EXISTS also migrates DB files created before the indexes existed.
+        # (has_embedded, id) covers the stats counts and serves the keyset backlog
+        # scan as an ordered range, so it stays proportional to pending rows. It replaces
+        # the earlier pending/has_embedded pair, which files created with them still carry.
+        self.conn.executescript('''
+            DROP INDEX IF EXISTS idx_jobs_pending;
+            DROP INDEX IF EXISTS idx_jobs_has_embedded;
+            CREATE INDEX IF NOT EXISTS idx_jobs_embedding_backlog ON jobs(has_embedded, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs(scraped_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_category ON jobs(category);
+            CREATE INDEX IF NOT EXISTS idx_jobs_embedded_at ON jobs(embedded_at);
+        ''')
+        # Near-duplicate index (services/NearDuplicateDetector.py): one MinHash signature
+        # per canonical job, its LSH band buckets, and reposts collapsed onto a canonical id
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS job_minhash (
+                job_id TEXT PRIMARY KEY,
+                title TEXT,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_lsh_buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                job_id TEXT NOT NULL,
+                PRIMARY KEY (band, bucket, job_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS job_duplicates (
+                job_id TEXT PRIMARY KEY,
+                canonical_id TEXT NOT NULL,
+                url TEXT,
+                similarity REAL,
+                detected_at TEXT NOT NULL
+            );
+        ''')
+        # Watermark per export, plus the rows already exported above it (services/export_service.py)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS export_watermarks (
+                name TEXT PRIMARY KEY,
+                watermark TEXT NOT NULL,
+                exported_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS export_overlap (
+                name TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                changed_at TEXT NOT NULL,
+                PRIMARY KEY (name, job_id)
+            );
+        ''')
 
         self.conn.commit()
 
-    def insert_job(self, job: Job):
-        job_id = hashlib.sha256(job.description.encode("utf-8")).hexdigest()
+    def insert_job(self, job: Union[Job, JobRecord]):
         cursor = self.conn.execute(
             '''
             INSERT OR IGNORE INTO jobs
             (id, title, company, description, url, location, posted_date, scraped_at, category)
             VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', 
-            (   
-                job_id,
-                job.title,
-                job.company,
-                job.description,
-                str(job.url),
-                job.location,
-                job.posted_date.isoformat() if job.posted_date else None,
-                job.scraped_at.isoformat(),
-                job.category
-            )
+            job_to_row(job)
         )
         self.conn.commit()
         return cursor.rowcount == 1
 
-    def insert_jobs_bulk(self, jobs: List[Job]):
-        job_tuple = []
-    
-        for job in jobs:
-            job_id = f"{job.company}_{hash(str(job.url))}"
-            job_tuple.append(
-                (
-                    job_id,
-                    job.title,
-                    job.company,
-                    job.description,
-                    str(job.url),
-                    job.location,
-                    job.posted_date.isoformat() if job.posted_date else None,
-                    job.scraped_at.isoformat()
-                )
+    def insert_jobs_bulk(self, jobs: Iterable[Union[Job, JobRecord]]) -> Dict[str, int]:
+        """
+        Insert a batch of jobs with a single executemany in one transaction.
+        Returns counts of inserted rows and rows ignored as duplicates.
+        """
+        job_rows = [job_to_row(job) for job in jobs]
+        if not job_rows:
+            return {"inserted": 0, "ignored": 0}
+
+        # `with self.conn` commits once on success and rolls back the whole batch on error
+        with self.conn:
+            cursor = self.conn.executemany(
+                '''
+                INSERT OR IGNORE INTO jobs
+                (id, title, company, description, url, location, posted_date, scraped_at, category)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', 
+                job_rows
             )
+        inserted = cursor.rowcount
+        return {"inserted": inserted, "ignored": len(job_rows) - inserted}
 
-        self.conn.executemany(
-            '''
-            INSERT OR IGNORE INTO jobs
-            (id, title, company, description, url, location, posted_date, scraped_at)
-            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
-            ''', 
-            job_tuple
-        )
-        self.conn.commit()
+    def update_categories(self, categories: Iterable[Tuple[str, str]]) -> int:
+        """Bulk-set (job_id, category) pairs in one transaction. Returns rows changed."""
+        with self.conn:
+            cursor = self.conn.executemany(
+                "UPDATE jobs SET category = ? WHERE id = ?",
+                [(category, job_id) for job_id, category in categories]
+            )
+        return cursor.rowcount
 
     def get_all_jobs(self):
         cursor = self.conn.execute("SELECT * FROM jobs ORDER BY scraped_at DESC")
         return [dict(row) for row in cursor.fetchall()]
     
+    def iter_jobs(self, changed_since: Optional[str] = None, chunk_size: int = 1000) -> Iterator[sqlite3.Row]:
+        """
+        Stream job rows with fetchmany instead of materialising the table.
+        With `changed_since` (ISO timestamp) only rows scraped or embedded after it
+        are returned, via idx_jobs_scraped_at / idx_jobs_embedded_at.
+        """
+        if changed_since is None:
+            cursor = self.conn.execute("SELECT * FROM jobs ORDER BY scraped_at DESC")
+        else:
+            cursor = self.conn.execute(
+                "SELECT * FROM jobs WHERE scraped_at > ? OR embedded_at > ?",
+                (changed_since, changed_since)
+            )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
+
+    def get_export_watermark(self, name: str) -> Optional[str]:
+        cursor = self.conn.execute("SELECT watermark FROM export_watermarks WHERE name = ?", (name,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def get_export_overlap(self, name: str) -> Dict[str, str]:
+        """job_id -> change timestamp of rows already exported that lie above the watermark."""
+        cursor = self.conn.execute("SELECT job_id, changed_at FROM export_overlap WHERE name = ?", (name,))
+        return dict(cursor.fetchall())
+
+    def set_export_watermark(self, name: str, watermark: str, overlap: Optional[Dict[str, str]] = None):
+        """Store the watermark and replace the overlap rows of export `name` in one transaction."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO export_watermarks (name, watermark, exported_at) VALUES (?, ?, ?)",
+                (name, watermark, datetime.now().isoformat())
+            )
+            self.conn.execute("DELETE FROM export_overlap WHERE name = ?", (name,))
+            self.conn.executemany(
+                "INSERT INTO export_overlap (name, job_id, changed_at) VALUES (?, ?, ?)",
+                [(name, job_id, changed_at) for job_id, changed_at in (overlap or {}).items()]
+            )
+
     def get_data_count(self):
         cursor = self.conn.execute("SELECT COUNT(*) FROM jobs")
         return cursor.fetchone()[0]
     
     def mark_as_embedded(self, job_id) -> bool:
         try:
-            self.conn.execute(
-                '''
-                UPDATE jobs
-                SET has_embedded = TRUE,
-                embedded_at = ?
-                WHERE id = ?
-                ''',
-                (datetime.now().isoformat(), job_id)
-            )
-
-            self.conn.commit()
-            return True
+            return job_id in self.mark_many_as_embedded([job_id])
         except Exception as e:
             print(f"Error marking job as embedded: {e}")
             return False
+
+    def mark_many_as_embedded(self, job_ids: Iterable[str]) -> Set[str]:
+        """
+        Flag a batch of jobs as embedded with one timestamp in one transaction.
+        Returns the ids that were actually updated; raises (after rollback) on failure
+        so callers never see a partially applied batch.
+        """
+        job_ids = list(dict.fromkeys(job_ids))
+        if not job_ids:
+            return set()
+
+        embedded_at = datetime.now().isoformat()
+        updated_ids = set()
+
+        with self.conn:
+            for start in range(0, len(job_ids), SQLITE_MAX_VARIABLES):
+                chunk = job_ids[start:start + SQLITE_MAX_VARIABLES]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = self.conn.execute(
+                    f"SELECT id FROM jobs WHERE id IN ({placeholders})",
+                    chunk
+                )
+                updated_ids.update(row[0] for row in cursor)
+                self.conn.execute(
+                    f'''
+                    UPDATE jobs
+                    SET has_embedded = TRUE,
+                    embedded_at = ?
+                    WHERE id IN ({placeholders})
+                    ''',
+                    (embedded_at, *chunk)
+                )
+
+        return updated_ids
         
     def get_jobs_without_embedding(self, limit=50):
         if limit is not None:
@@ -116,6 +249,7 @@ class Database:
                 '''
                 SELECT * FROM jobs
                 WHERE has_embedded = FALSE
+                AND id NOT IN (SELECT job_id FROM job_duplicates)
                 LIMIT ?
                 ''',
                 (limit,)
@@ -125,10 +259,36 @@ class Database:
                 '''
                 SELECT * FROM jobs
                 WHERE has_embedded = FALSE
+                AND id NOT IN (SELECT job_id FROM job_duplicates)
                 ''',
             )
         return [dict(row) for row in cursor.fetchall()]
     
+    def iter_jobs_without_embedding(self, chunk_size: int = 64) -> Iterator[List[Dict]]:
+        """
+        Page through the embedding backlog with a keyset cursor on id.
+        Each page is a range scan on idx_jobs_embedding_backlog, so only one chunk is held in memory
+        and rows marked as embedded between pages do not shift the cursor.
+        Rows collapsed onto a canonical job (job_duplicates) are never embedded.
+        """
+        last_id = ""
+        while True:
+            cursor = self.conn.execute(
+                '''
+                SELECT * FROM jobs
+                WHERE has_embedded = FALSE AND id > ?
+                AND id NOT IN (SELECT job_id FROM job_duplicates)
+                ORDER BY id
+                LIMIT ?
+                ''',
+                (last_id, chunk_size)
+            )
+            chunk = [dict(row) for row in cursor.fetchall()]
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1]['id']
+
     def get_stats(self):
         stats = {}
 
@@ -138,17 +298,32 @@ class Database:
         cursor = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE has_embedded = TRUE")
         stats['embedded_jobs'] = cursor.fetchone()[0]
 
-        cursor = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE has_embedded = False")
+        cursor = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE has_embedded = False "
+            "AND id NOT IN (SELECT job_id FROM job_duplicates)"
+        )
         stats['pending_embeddings'] = cursor.fetchone()[0]
 
+        cursor = self.conn.execute("SELECT COUNT(*) FROM job_duplicates")
+        stats['near_duplicates'] = cursor.fetchone()[0]
+
         return stats
 
     def close(self):
         if self.conn:
+            if self.performance:
+                self.conn.execute("PRAGMA optimize")
             self.conn.close()
 
     def _connect(self):
-        self.conn = sqlite3.connect(self.db_path, timeout=10)  # Add timeout
+        self.conn = sqlite3.connect(self.db_path, timeout=10)  # Wait on locks instead of failing
         self.conn.row_factory = sqlite3.Row
+        if self.performance:
+            self._apply_performance_profile()
         self.create_tables()
 
+    def _apply_performance_profile(self):
+        for pragma, value in PERFORMANCE_PRAGMAS.items():
+            self.conn.execute(f"PRAGMA {pragma} = {value}")
+
+
@@ -1,6 +1,8 @@
-from RAG import LLMService, SimpleRetrievalStrategy
+from RAG import ContextBuilder, HybridRetrievalStrategy, LLMService, SemanticResponseCache, SimpleRetrievalStrategy
 from services.vector_db.QdrantService import QdrantService
 from services.BigQueryService import BigQueryService
+from services.embedders import get_embedder
+from services.KeywordIndex import KeywordIndex
 import streamlit as st
 from streamlit_echarts import st_echarts
 import os
@@ -12,6 +14,10 @@ QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
 QDRANT_ENDPOINT = os.getenv('QDRANT_CLUSTER_ENDPOINT')
 # Default to False (Cloud Mode) unless explicitly set to 'true'
 QDRANT_LOCAL_MODE = os.getenv('QDRANT_LOCAL_MODE', 'False').lower() == 'true'
+# Answers shared by every session (and restart); set to an empty string to disable
+RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', './data/response_cache.db')
+# BM25 index of the Qdrant collection (built by the BigQuery/Qdrant DAG); hybrid retrieval is used when present
+KEYWORD_INDEX_PATH = os.getenv('KEYWORD_INDEX_PATH', './data/keyword_index_qdrant.db')
 
 # Initialize Services
 @st.cache_resource
@@ -21,13 +27,23 @@ def init_services():
         st.error("Missing QDRANT_CLUSTER_ENDPOINT! Please add it to Streamlit Secrets.")
         st.stop()
         
+    embedder = get_embedder()
     qdrant = QdrantService(
         API_KEY=QDRANT_API_KEY, 
         url=QDRANT_ENDPOINT or 'http://localhost:6333', 
-        local=QDRANT_LOCAL_MODE
+        local=QDRANT_LOCAL_MODE,
+        embedder=embedder,
+        # Shared across sessions via st.cache_resource, so popular queries skip embed + search
+        result_cache_size=128
     )
-    strategy = SimpleRetrievalStrategy()
-    llm = LLMService(qdrant, strategy)
+    if os.path.exists(KEYWORD_INDEX_PATH):
+        strategy = HybridRetrievalStrategy(KeywordIndex(KEYWORD_INDEX_PATH))
+    else:
+        strategy = SimpleRetrievalStrategy()
+    response_cache = SemanticResponseCache(embedder, path=RESPONSE_CACHE_PATH) if RESPONSE_CACHE_PATH else None
+    # Lexical passage scoring: embedding ~50 passages per question would delay the first token
+    llm = LLMService(qdrant, strategy, context_builder=ContextBuilder(),
+                     response_cache=response_cache)
     
     GCP_PROJECT = "jobpulse-492611"
     
@@ -91,6 +107,25 @@ def get_total_count():
 
 data_count = get_total_count()
 
+def stream_answer(question: str):
+    """Show the retrieved jobs as soon as search is done, then render the answer token by token."""
+    with st.chat_message("ai"):
+        try:
+            with st.spinner("Searching Qdrant..."):
+                response = llm_service.stream_query(question)
+            st.caption(f"🔎 Found {len(response.docs)} matching jobs in {response.timings['retrieve']:.2f}s")
+            answer = st.write_stream(response)
+            timings = response.timings
+            if response.cached:
+                st.caption(f"⚡ Answered from cache in {timings['last_token']:.2f}s")
+            else:
+                st.caption(f"⏱️ First token after {timings.get('first_token', timings['last_token']):.2f}s, "
+                           f"complete after {timings['last_token']:.2f}s")
+        except Exception as e:
+            answer = f"Error processing query: {str(e)}"
+            st.markdown(answer)
+    st.session_state.messages.append({"role": "ai", "content": answer})
+
 # --- UI Layout ---
 st.set_page_config(page_title="JobPulse", page_icon="🚀", layout="wide")
 
@@ -118,9 +153,8 @@ with tab_chat:
         selection = st.pills("Suggested Searches", list(SUGGESTIONS.keys()), format_func=lambda x: SUGGESTIONS[x] )
         if selection:
             st.session_state.messages.append({"role": "user", "content": selection})
-            with st.spinner("Searching..."):
-                response  = llm_service.query(selection)
-            st.session_state.messages.append({"role": "ai", "content": response})
+            # Answered below the history on the next run, so it can stream into the chat
+            st.session_state.pending_question = selection
             st.rerun()
 
     # Display Chat History
@@ -128,13 +162,15 @@ with tab_chat:
         with st.chat_message(message['role']):
             st.markdown(message["content"])
 
+    if question := st.session_state.pop("pending_question", None):
+        stream_answer(question)
+        st.rerun()
+
     # Chat Input
     if prompt := st.chat_input("Ask about jobs..."):
         st.chat_message("user").markdown(prompt)
         st.session_state.messages.append({"role": "user", "content": prompt})
-        with st.spinner("Searching Qdrant..."):
-            response  = llm_service.query(prompt)
-        st.session_state.messages.append({"role": "ai", "content": response})
+        stream_answer(prompt)
         st.rerun()
 
 with tab_insights:
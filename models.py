@@ -1,6 +1,9 @@
 from pydantic import BaseModel, Field, HttpUrl, validator
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass
 from datetime import datetime
+import hashlib
+import json
 
 class Job(BaseModel):
     title: str = Field(..., min_length=1, description="Job title")
@@ -13,3 +16,106 @@ class Job(BaseModel):
     has_embedded: bool = Field(default=False, description="This job has been embedded or not?")
     embedded_at: Optional[datetime] = Field(default=None)
     category: Optional[str] = Field(default=None) # New field
+
+def generate_job_id(description: str) -> str:
+    """Stable job id shared by every ingest path (sha256 of the description)."""
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+# Tracking fields kept in SQLite/BigQuery but not in vector store payloads
+TRACKING_FIELDS = ("has_embedded", "embedded_at")
+
+@dataclass(slots=True)
+class JobRecord:
+    """
+    Compact internal job record for trusted hops after the scraper boundary.
+    Built once from a validated Job (or read back from our own stores) and never
+    re-validated; dates are kept as ISO strings, the form every store uses.
+    """
+    id: str
+    title: str
+    company: str
+    description: str
+    url: Optional[str]
+    location: str = "Unknown"
+    posted_date: Optional[str] = None
+    scraped_at: Optional[str] = None
+    has_embedded: bool = False
+    embedded_at: Optional[str] = None
+    category: Optional[str] = None
+
+    @classmethod
+    def from_job(cls, job: Job) -> "JobRecord":
+        return cls(
+            id=generate_job_id(job.description),
+            title=job.title,
+            company=job.company,
+            description=job.description,
+            url=str(job.url) if job.url else None,
+            location=job.location,
+            posted_date=job.posted_date.isoformat() if job.posted_date else None,
+            scraped_at=job.scraped_at.isoformat(),
+            has_embedded=job.has_embedded,
+            embedded_at=job.embedded_at.isoformat() if job.embedded_at else None,
+            category=job.category,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobRecord":
+        """Trusted conversion from a SQLite row dict, NDJSON object or vector payload."""
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            company=data["company"],
+            description=data.get("description") or "",
+            url=data.get("url"),
+            location=data.get("location") or "Unknown",
+            posted_date=data.get("posted_date"),
+            scraped_at=data.get("scraped_at"),
+            has_embedded=bool(data.get("has_embedded") or False),
+            embedded_at=data.get("embedded_at"),
+            category=data.get("category"),
+        )
+
+    @classmethod
+    def from_row(cls, row) -> "JobRecord":
+        """From a `SELECT * FROM jobs` row; the jobs columns are in field order."""
+        record = cls(*row)
+        record.has_embedded = bool(record.has_embedded)
+        return record
+
+    @classmethod
+    def from_json(cls, line: str) -> "JobRecord":
+        return cls.from_dict(json.loads(line))
+
+    def to_row(self) -> Tuple:
+        """Values in the column order of Database's INSERT statements."""
+        return (
+            self.id,
+            self.title,
+            self.company,
+            self.description,
+            str(self.url),
+            self.location,
+            self.posted_date,
+            self.scraped_at,
+            self.category
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "company": self.company,
+            "description": self.description,
+            "url": self.url,
+            "location": self.location,
+            "posted_date": self.posted_date,
+            "scraped_at": self.scraped_at,
+            "has_embedded": self.has_embedded,
+            "embedded_at": self.embedded_at,
+            "category": self.category,
+        }
+
+    def to_json(self) -> str:
+        """One NDJSON line with the BigQuery jobs schema fields."""
+        return json.dumps(self.to_dict())
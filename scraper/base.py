@@ -0,0 +1,31 @@
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+# (url, query params) of the next page to fetch
+PageRequest = Tuple[str, Optional[Dict]]
+
+class PaginatedScraper:
+    """
+    Base for JSON job APIs that page with a cursor, page number or next link.
+    Subclasses set `url` and implement parse_page(); fetch_pages() walks the pages
+    through an AsyncFetcher and yields each page's raw jobs as soon as it arrives.
+    """
+    url: str
+    max_pages: int = 50
+
+    def first_request(self) -> PageRequest:
+        return self.url, None
+
+    def parse_page(self, payload, request: PageRequest) -> Tuple[List[dict], Optional[PageRequest]]:
+        """Return (raw jobs on this page, request for the next page or None)."""
+        raise NotImplementedError
+
+    async def fetch_pages(self, fetcher) -> AsyncIterator[List[dict]]:
+        request = self.first_request()
+        pages = 0
+        while request is not None and pages < self.max_pages:
+            url, params = request
+            payload = await fetcher.get_json(url, params=params)
+            jobs, request = self.parse_page(payload, request)
+            pages += 1
+            if jobs:
+                yield jobs
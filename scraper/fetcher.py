@@ -0,0 +1,83 @@
+import asyncio
+import random
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+class AsyncFetcher:
+    """
+    Shared async HTTP client for all job sources.
+    One pooled httpx.AsyncClient (keep-alive connections are reused across sources),
+    a semaphore per host so no board gets more than `per_host_limit` concurrent
+    requests, and retries with full-jitter exponential backoff.
+    """
+    def __init__(self, max_connections: int = 20, per_host_limit: int = 4, timeout: float = 30,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30,
+                 headers: Optional[Dict[str, str]] = None):
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.headers = {"User-Agent": "JobPulse/1.0", **(headers or {})}
+        self.client = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {"requests": 0, "retries": 0}
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=httpx.Timeout(self.timeout),
+            headers=self.headers,
+            follow_redirects=True,
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+        self.client = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        # Full jitter: uniform over [0, base * 2^attempt], so clients retrying together spread out
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def get(self, url: str, params: Optional[Dict] = None,
+                  headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET with retries; returns 2xx/304 responses and raises httpx.HTTPError otherwise."""
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                async with self._host_limit(url):
+                    self.stats["requests"] += 1
+                    response = await self.client.get(url, params=params, headers=headers)
+                if response.status_code not in RETRYABLE_STATUS:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            self.stats["retries"] += 1
+            # Sleep outside the host semaphore so other requests to the host can proceed
+            await asyncio.sleep(self._backoff(attempt, response))
+
+    async def get_json(self, url: str, params: Optional[Dict] = None,
+                       headers: Optional[Dict[str, str]] = None):
+        response = await self.get(url, params=params, headers=headers)
+        return response.json()
@@ -0,0 +1,88 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Iterable, Optional
+
+from adapters.remoteOK_adapter import TransformResult
+from scraper.fetcher import AsyncFetcher
+from scraper.registry import get_source, list_sources
+
+@dataclass
+class SourceResult:
+    """Per-source outcome of an ingest run; `scraper` is kept for commit_state()."""
+    name: str
+    scraper: object
+    pages: int = 0
+    raw_jobs: int = 0
+    transform: TransformResult = field(default_factory=TransformResult)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+async def ingest_sources(source_names: Optional[Iterable[str]] = None,
+                         scraper_kwargs: Optional[Dict[str, Dict]] = None,
+                         fetcher_kwargs: Optional[Dict] = None,
+                         processes: Optional[int] = None, chunksize: int = 64) -> Dict[str, SourceResult]:
+    """
+    Fetch every source concurrently through one AsyncFetcher and hand each page to
+    its adapter's transform_batch as soon as it arrives, so CPU-bound cleaning of
+    early pages overlaps with network waits for later pages and other boards.
+    Pages are split into chunks of `chunksize` across the pool, so a single-page feed
+    like RemoteOK still uses every process.
+    A failing source is recorded in its SourceResult and does not stop the others.
+    """
+    source_names = list(source_names or list_sources())
+    scraper_kwargs = scraper_kwargs or {}
+    loop = asyncio.get_running_loop()
+
+    processes = processes or multiprocessing.cpu_count()
+    # Daemonic processes (e.g. some Celery workers) cannot start a pool; fall back to threads
+    if processes == 1 or multiprocessing.current_process().daemon:
+        executor = None
+        processes = 1
+    else:
+        executor = ProcessPoolExecutor(max_workers=processes)
+
+    results = {}
+    for name in source_names:
+        source = get_source(name)
+        results[name] = SourceResult(name=name, scraper=source.scraper(**scraper_kwargs.get(name, {})))
+
+    async def run_source(name: str):
+        source = get_source(name)
+        result = results[name]
+        result.transform.processes = processes
+        started = time.perf_counter()
+        transforms = []
+        try:
+            async for page in result.scraper.fetch_pages(fetcher):
+                # Transform this page while the next one is being fetched
+                for start in range(0, len(page), chunksize):
+                    transform = partial(source.adapter.transform_batch, page[start:start + chunksize], processes=1)
+                    transforms.append((result.raw_jobs + start, loop.run_in_executor(executor, transform)))
+                result.pages += 1
+                result.raw_jobs += len(page)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        for offset, future in transforms:
+            try:
+                result.transform.merge(await future, offset)
+            except Exception as e:
+                result.error = result.error or f"{type(e).__name__}: {e}"
+        result.elapsed = result.transform.elapsed = time.perf_counter() - started
+        print(f"[{name}] {result.pages} pages, {result.raw_jobs} raw -> {len(result.transform.jobs)} jobs "
+              f"in {result.elapsed:.2f}s" + (f" (error: {result.error})" if result.error else ""))
+
+    try:
+        async with AsyncFetcher(**(fetcher_kwargs or {})) as fetcher:
+            await asyncio.gather(*(run_source(name) for name in source_names))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+def run_ingest(source_names: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, SourceResult]:
+    """Synchronous entry point for DAG tasks and scripts."""
+    return asyncio.run(ingest_sources(source_names, **kwargs))
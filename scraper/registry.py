@@ -0,0 +1,32 @@
+from typing import Dict, List, NamedTuple
+
+from adapters.remoteOK_adapter import RemoteOKAdapter
+from scraper.remoteOK import RemoteOKScraper
+
+class JobSource(NamedTuple):
+    """
+    A job board: a scraper with an async fetch_pages(fetcher) generator and an
+    adapter with a static transform_batch(raw_jobs, processes) -> TransformResult.
+    """
+    name: str
+    scraper: type
+    adapter: type
+
+SOURCES: Dict[str, JobSource] = {}
+
+def register_source(name: str, scraper: type, adapter: type) -> JobSource:
+    if name in SOURCES:
+        raise ValueError(f"Job source '{name}' is already registered")
+    SOURCES[name] = JobSource(name, scraper, adapter)
+    return SOURCES[name]
+
+def get_source(name: str) -> JobSource:
+    try:
+        return SOURCES[name]
+    except KeyError:
+        raise ValueError(f"Unknown job source '{name}'. Registered: {', '.join(SOURCES)}") from None
+
+def list_sources() -> List[str]:
+    return list(SOURCES)
+
+register_source("remoteok", RemoteOKScraper, RemoteOKAdapter)
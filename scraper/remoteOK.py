@@ -1,11 +1,134 @@
+import json
+import os
+from typing import Dict, List, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils import atomic_write
+
+# Keep the newest seen ids; the API only lists recent postings, so older ids never come back
+MAX_SEEN_IDS = 20000
 
 class RemoteOKScraper:
-    def __init__(self):
-        self.url = "https://remoteok.com/api"
+    def __init__(self, url: str = "https://remoteok.com/api", state_path: Optional[str] = None,
+                 timeout: float = 30, max_retries: int = 3, backoff_factor: float = 1.0,
+                 max_seen_ids: int = MAX_SEEN_IDS):
+        self.url = url
+        self.state_path = state_path
+        self.max_seen_ids = max_seen_ids
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "JobPulse/1.0 (+https://remoteok.com/api)"
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+        )
+        self.session.mount("http://", HTTPAdapter(max_retries=retry))
+        self.session.mount("https://", HTTPAdapter(max_retries=retry))
+
+        self.state = self._load_state()
+        self._pending_state = None
 
     def scrape_jobs(self):
-        response = requests.get(self.url)
+        """Full fetch of the API feed (no conditional headers, no filtering)."""
+        response = self.session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
         jobs = response.json()
 
-        return jobs
\ No newline at end of file
+        return jobs
+
+    def scrape_new_jobs(self) -> List[Dict]:
+        """
+        Incremental fetch: send the stored ETag / Last-Modified validators, return []
+        on 304, otherwise only postings whose RemoteOK id has not been seen before.
+        The new state is staged and only persisted by commit_state(), so a run that
+        fails after scraping does not lose the jobs it fetched.
+        """
+        response = self.session.get(self.url, headers=self._conditional_headers(), timeout=self.timeout)
+        if response.status_code == 304:
+            return self._not_modified()
+        response.raise_for_status()
+        return self._accept_feed(response.headers, response.json())
+
+    async def fetch_pages(self, fetcher):
+        """
+        Async variant of scrape_new_jobs() for the multi-source pipeline
+        (scraper.pipeline). The RemoteOK API is a single page.
+        """
+        response = await fetcher.get(self.url, headers=self._conditional_headers())
+        if response.status_code == 304:
+            self._not_modified()
+            return
+        new_jobs = self._accept_feed(response.headers, response.json())
+        if new_jobs:
+            yield new_jobs
+
+    def _conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.state.get("etag"):
+            headers["If-None-Match"] = self.state["etag"]
+        if self.state.get("last_modified"):
+            headers["If-Modified-Since"] = self.state["last_modified"]
+        return headers
+
+    def _not_modified(self) -> List[Dict]:
+        print("RemoteOK feed not modified since last run")
+        self._pending_state = None
+        return []
+
+    def _accept_feed(self, headers, feed: List) -> List[Dict]:
+        """Filter a 200 feed down to unseen postings and stage the next state."""
+        # The first element of the feed is a legal notice without an id
+        postings = [job for job in feed if isinstance(job, dict) and job.get("id")]
+
+        seen_ids = set(self.state.get("seen_ids", []))
+        new_jobs = [job for job in postings if str(job["id"]) not in seen_ids]
+        print(f"RemoteOK feed: {len(postings)} postings, {len(new_jobs)} new")
+
+        self._pending_state = self._next_state(headers, postings)
+        return new_jobs
+
+    def commit_state(self):
+        """Persist the state staged by the last scrape_new_jobs() call."""
+        if self._pending_state is None:
+            return
+        self.state = self._pending_state
+        self._pending_state = None
+        if self.state_path:
+            self._save_state(self.state)
+
+    def _next_state(self, headers, postings: List[Dict]) -> Dict:
+        # Newest ids last, so trimming from the front drops the oldest
+        seen_ids = list(self.state.get("seen_ids", []))
+        known = set(seen_ids)
+        for job in sorted(postings, key=lambda job: int(job.get("epoch") or 0)):
+            job_id = str(job["id"])
+            if job_id not in known:
+                known.add(job_id)
+                seen_ids.append(job_id)
+
+        # New postings are told apart by seen id alone, so no id/epoch high-water mark is stored
+        return {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "seen_ids": seen_ids[-self.max_seen_ids:],
+        }
+
+    def _load_state(self) -> Dict:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable scraper state {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self, state: Dict):
+        with atomic_write(self.state_path, 'w', encoding="utf-8") as f:
+            json.dump(state, f)
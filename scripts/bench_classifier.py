@@ -0,0 +1,67 @@
+"""
+Compare the compiled KeywordClassifier with the previous substring classifier on jobs.json.
+
+Reports per-job cost for both and how often their labels agree.
+
+Usage: python -m scripts.bench_classifier [--json-path jobs.json] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.JobClassificationService import CATEGORY_KEYWORDS, KeywordClassifier
+from utils import clean_text
+
+LEGACY_KEYWORDS = {
+    category: ["r " if kw == "r" else kw for kw in keywords]
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+
+def legacy_classify_category(title, description):
+    text = f"{title or ''} {description or ''}".lower()
+    scores = {
+        category: sum(1 for kw in keywords if kw in text)
+        for category, keywords in LEGACY_KEYWORDS.items()
+    }
+    best_match = max(scores, key=scores.get)
+    return best_match if scores[best_match] > 0 else "Other"
+
+def timed(fn, jobs, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        labels = [fn(title, description) for title, description in jobs]
+        best = min(best, time.perf_counter() - start)
+    return labels, best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json-path", default="jobs.json")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.json_path, "r") as f:
+        raw_jobs = json.load(f)
+    jobs = [(job.get("title") or job.get("position", ""), clean_text(job.get("description", ""))) for job in raw_jobs]
+
+    classifier = KeywordClassifier()
+    legacy_labels, legacy_time = timed(legacy_classify_category, jobs, args.repeat)
+    labels, compiled_time = timed(classifier.classify, jobs, args.repeat)
+
+    print(f"{len(jobs)} jobs")
+    print(f"  legacy substring : {legacy_time / len(jobs) * 1e6:8.1f} us/job")
+    print(f"  compiled regex   : {compiled_time / len(jobs) * 1e6:8.1f} us/job")
+
+    agree = sum(a == b for a, b in zip(legacy_labels, labels))
+    print(f"  label agreement  : {agree}/{len(jobs)}")
+    changes = Counter((a, b) for a, b in zip(legacy_labels, labels) if a != b)
+    for (old, new), count in changes.most_common(10):
+        print(f"    {count:4d}  {old} -> {new}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark utils.clean_text against the previous BeautifulSoup implementation.
+
+Reports the per-document cost of both on every description in jobs.json; the
+outputs are compared in tests/test_clean_text.py.
+
+Usage: python -m scripts.bench_clean_text [--json-path jobs.json] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+from utils import clean_text, clean_texts
+
+def reference_clean_text(text):
+    if not text:
+        return ""
+    soup = BeautifulSoup(text, 'html.parser')
+    text = soup.get_text(separator='\n')
+    text = re.sub(r'\\u[0-9a-fA-F]{4}', '', text)
+    text = text.replace(r'\/', '/')
+    text = re.sub(r"</[a-z]+>", "", text)
+    cleaned_text = re.sub(r'Please mention the word .*? human\.', '', text, flags=re.DOTALL | re.IGNORECASE)
+    return cleaned_text.strip()
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json-path", default="jobs.json")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.json_path, "r") as f:
+        descriptions = [job.get("description", "") for job in json.load(f)]
+
+    print(f"{len(descriptions)} descriptions")
+    reference = best_time(lambda: [reference_clean_text(t) for t in descriptions], args.repeat)
+    streaming = best_time(lambda: [clean_text(t) for t in descriptions], args.repeat)
+    pooled = best_time(lambda: clean_texts(descriptions, processes=os.cpu_count()), args.repeat)
+    n = len(descriptions)
+    print(f"  BeautifulSoup      : {reference / n * 1e6:8.1f} us/doc")
+    print(f"  streaming          : {streaming / n * 1e6:8.1f} us/doc ({reference / streaming:.1f}x)")
+    print(f"  streaming + pool   : {pooled / n * 1e6:8.1f} us/doc ({reference / pooled:.1f}x)")
+
+if __name__ == "__main__":
+    main()
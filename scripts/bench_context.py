@@ -0,0 +1,81 @@
+"""
+Compare prompt context size of the old fixed truncation with the token-budgeted ContextBuilder.
+
+For each question, the top-k jobs of jobs.json by title overlap stand in for the
+retrieved docs. Reports tokens and characters of both contexts and the build time,
+and checks that every job keeps its title, company, location and URL.
+Passages are scored lexically unless --embedder is given (loads the embedding model).
+
+Usage: python -m scripts.bench_context [--json-path jobs.json] [--k 5] [--budget 2000] [--embedder]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from RAG.context import WORD_RE, ContextBuilder
+from RAG.LLMService import format_docs
+from utils import clean_text
+
+QUESTIONS = [
+    "Find me AI engineer jobs with Python",
+    "Remote data engineer roles in Europe, what do they pay?",
+    "Senior React frontend developer",
+    "DevOps jobs with Kubernetes and AWS",
+    "Product designer positions",
+]
+
+def top_k(docs, question, k):
+    terms = set(WORD_RE.findall(question.lower()))
+    return sorted(docs, key=lambda doc: -len(terms & set(WORD_RE.findall(doc['title'].lower()))))[:k]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json-path", default="jobs.json")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--budget", type=int, default=2000)
+    parser.add_argument("--embedder", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.json_path, 'r', encoding='utf-8') as f:
+        docs = [dict(job, description=clean_text(job['description'] or "")) for job in json.load(f)]
+
+    embedder = None
+    if args.embedder:
+        from services.embedders import get_embedder
+        embedder = get_embedder()
+    builder = ContextBuilder(embedder=embedder, token_budget=args.budget)
+    count = builder.counter.count
+
+    ok = True
+    totals = [0, 0]
+    for question in QUESTIONS:
+        retrieved = top_k(docs, question, args.k)
+        old = format_docs(retrieved)
+        started = time.perf_counter()
+        new = format_docs(retrieved, question, builder)
+        elapsed = time.perf_counter() - started
+
+        old_tokens, new_tokens = count(old), count(new)
+        totals[0] += old_tokens
+        totals[1] += new_tokens
+        print(f"{question[:40]:<40} {old_tokens:>6} -> {new_tokens:>5} tokens "
+              f"({len(old):>6} -> {len(new):>5} chars) in {elapsed * 1000:.1f}ms")
+
+        blocks = new.split("\n\n")
+        fields_kept = len(blocks) == len(retrieved) and all(
+            block.startswith(f"{doc['title']} at {doc['company']}, {doc.get('location', 'N/A')}:")
+            and block.endswith(f"Source: {doc['url']}")
+            for block, doc in zip(blocks, retrieved))
+        if new_tokens > args.budget or not fields_kept:
+            print(f"❌ over budget or missing fields for '{question}'")
+            ok = False
+
+    print(f"Total {totals[0]} -> {totals[1]} tokens ({1 - totals[1] / totals[0]:.0%} smaller)")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compare embedding throughput of the remote HuggingFace endpoint and local fastembed.
+
+Usage: python -m scripts.bench_embedders [--limit 200] [--backends huggingface fastembed]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.embedders import get_embedder
+
+def load_texts(json_path: str, limit: int):
+    with open(json_path, "r") as f:
+        jobs = json.load(f)
+    return [f"{job.get('title', '')}\n{job.get('company', '')}\n{job.get('description', '')}" for job in jobs[:limit]]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json-path", default="jobs.json")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--backends", nargs="+", default=["huggingface", "fastembed"])
+    args = parser.parse_args()
+
+    texts = load_texts(args.json_path, args.limit)
+    print(f"Embedding {len(texts)} job texts in batches of {args.batch_size}")
+
+    for backend in args.backends:
+        embedder = get_embedder(backend)
+        embedder.embed_documents(texts[:1])  # warm up (model download / connection)
+
+        start = time.perf_counter()
+        for i in range(0, len(texts), args.batch_size):
+            embedder.embed_documents(texts[i:i + args.batch_size])
+        elapsed = time.perf_counter() - start
+
+        print(f"{backend:>12}: {elapsed:.2f}s total, {len(texts) / elapsed:.1f} docs/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark of rank fusion cost per query at 5 lists x 50 hits.
+
+Compares id-keyed fusion (RAG.fusion) with the previous approach that
+JSON-serialized every hit via langchain_core.load.dumps/loads.
+
+Usage: python -m scripts.bench_fusion [--lists 5] [--hits 50] [--repeat 200]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from RAG.fusion import reciprocal_rank_fusion, score_fusion
+
+def legacy_rrf(results, k=60):
+    from langchain_core.load import dumps, loads
+
+    fused_scores = {}
+    for docs in results:
+        for rank, doc in enumerate(docs):
+            doc = dumps(doc)
+            if doc not in fused_scores:
+                fused_scores[doc] = 0
+            fused_scores[doc] += 1 / (rank + k)
+    reranked = sorted(fused_scores.items(), key=lambda x: x[1], reverse=True)
+    return [loads(doc) for doc, score in reranked]
+
+def build_hits(json_path, n_lists, n_hits, seed=0):
+    with open(json_path, "r") as f:
+        jobs = json.load(f)
+    rng = random.Random(seed)
+    results = []
+    for _ in range(n_lists):
+        sample = rng.sample(jobs, n_hits)
+        results.append([(job, 1.0 - rank / n_hits) for rank, job in enumerate(sample)])
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json-path", default="jobs.json")
+    parser.add_argument("--lists", type=int, default=5)
+    parser.add_argument("--hits", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    scored = build_hits(args.json_path, args.lists, args.hits)
+    ranked = [[doc for doc, _ in hits] for hits in scored]
+
+    cases = {
+        "rrf (id keyed)": lambda: reciprocal_rank_fusion(ranked),
+        "rrf top_k=5": lambda: reciprocal_rank_fusion(ranked, top_k=5),
+        "score fusion top_k=5": lambda: score_fusion(scored, top_k=5),
+    }
+    try:
+        import langchain_core  # noqa: F401
+        cases["legacy dumps/loads rrf"] = lambda: legacy_rrf(ranked)
+    except ImportError:
+        print("langchain_core not installed, skipping legacy baseline")
+
+    print(f"{args.lists} lists x {args.hits} hits, {args.repeat} runs each")
+    for name, fn in cases.items():
+        seconds = min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat
+        print(f"{name:>24}: {seconds * 1e6:10.1f} us/query")
+
+if __name__ == "__main__":
+    main()
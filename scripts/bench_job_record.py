@@ -0,0 +1,97 @@
+"""
+Compare pydantic Job objects with JobRecord on the internal hops of the pipeline.
+
+Reports retained memory, pickled size (process-pool transfer) and the cost of the
+row / NDJSON / payload conversions for both, using jobs.json as input.
+
+Usage: python -m scripts.bench_job_record [--json-path jobs.json] [--copies 20] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import job_to_row
+from models import Job, JobRecord, generate_job_id
+from services.vector_db.AbstractVectorDB import build_job_payload
+
+def load_jobs(json_path, copies):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        stored = json.load(f)
+    jobs = [
+        Job(
+            title=job['title'],
+            company=job['company'],
+            description=job['description'] or "",
+            url=job['url'] or None,
+            location=job['location'] or "Unknown",
+            posted_date=job.get('posted_date'),
+            category=job.get('category'),
+        )
+        for job in stored
+    ]
+    return jobs * copies
+
+def retained(build):
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, size
+
+def timed(fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def job_to_ndjson(job):
+    job_dict = job.model_dump(mode='json')
+    job_dict['id'] = generate_job_id(job.description)
+    return json.dumps(job_dict)
+
+def job_to_payload(job):
+    payload = json.loads(json.dumps(job.model_dump(), default=str))
+    payload.pop('has_embedded', None)
+    payload.pop('embedded_at', None)
+    return payload
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json-path", default="jobs.json")
+    parser.add_argument("--copies", type=int, default=20, help="Repeat the dataset to get a larger batch")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.json_path, args.copies)
+    _, job_memory = retained(lambda: [job.model_copy() for job in jobs])
+    records, record_memory = retained(lambda: [JobRecord.from_job(job) for job in jobs])
+
+    print(f"{len(jobs)} jobs")
+    print(f"{'':<24}{'Job':>12}{'JobRecord':>12}")
+    print(f"{'retained memory (KB)':<24}{job_memory / 1024:>12.0f}{record_memory / 1024:>12.0f}")
+    # Per object, so pickle's memo does not collapse the repeated dataset copies
+    print(f"{'pickled size (KB)':<24}{sum(len(pickle.dumps(job)) for job in jobs) / 1024:>12.0f}"
+          f"{sum(len(pickle.dumps(record)) for record in records) / 1024:>12.0f}")
+
+    conversions = [
+        ("sqlite row", job_to_row, job_to_row),
+        ("ndjson line", job_to_ndjson, JobRecord.to_json),
+        ("vector payload", job_to_payload, lambda record: build_job_payload(record.to_dict())),
+    ]
+    for name, job_fn, record_fn in conversions:
+        job_time = timed(job_fn, jobs, args.repeat)
+        record_time = timed(record_fn, records, args.repeat)
+        print(f"{name + ' (us/job)':<24}{job_time / len(jobs) * 1e6:>12.2f}"
+              f"{record_time / len(records) * 1e6:>12.2f}   ({job_time / record_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Re-categorise the whole corpus from the vectors already stored in Qdrant.
+
+Scrolls every point with its vector, seeds category centroids from the keyword
+classifier, labels all jobs with one matrix multiply and, with --apply, writes the new
+categories into the Qdrant payloads and the SQLite jobs table.
+Points embedded while the category was still part of the embedded text carry the old
+label in their vector; --reembed re-embeds the whole collection before fitting.
+
+Usage: python -m scripts.recategorize [--apply] [--reembed] [--db-path ...] [--save-centroids centroids.npz]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import Database
+from services.CentroidClassifier import CentroidClassifier
+from services.embedders import get_embedder
+from services.vector_db import QdrantService
+
+def batched(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def scroll_points(client, batch_size=512):
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name='job_collection',
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        yield from points
+        if offset is None:
+            return
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apply", action="store_true", help="Write new categories to Qdrant and SQLite")
+    parser.add_argument("--reembed", action="store_true",
+                        help="Re-embed every point without its category before fitting (implies writes to Qdrant)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--db-path", default=None, help="SQLite database to update alongside Qdrant")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--min-similarity", type=float, default=0.6)
+    parser.add_argument("--save-centroids", default=None, help="Save fitted centroids (.npz) for the scraper DAG")
+    args = parser.parse_args()
+
+    qdrant = QdrantService(
+        API_KEY=os.getenv('QDRANT_API_KEY'),
+        url=os.getenv('QDRANT_CLUSTER_ENDPOINT', 'http://localhost:6333'),
+        local=os.getenv('QDRANT_LOCAL_MODE', 'False').lower() == 'true',
+        embedder=get_embedder()
+    )
+
+    start = time.perf_counter()
+    points = list(scroll_points(qdrant.client))
+    if not points:
+        print("No points in job_collection")
+        return
+    payloads = [point.payload for point in points]
+    vectors = [point.vector for point in points]
+    print(f"Loaded {len(points)} vectors in {time.perf_counter() - start:.1f}s")
+
+    if args.reembed:
+        start = time.perf_counter()
+        vectors = []
+        with qdrant.batch_writes():
+            for batch in batched(payloads, args.batch_size):
+                embeddings = qdrant.create_embeddings(batch)
+                qdrant.upsert_embeddings(batch, embeddings)
+                vectors.extend(embeddings)
+        print(f"Re-embedded {len(points)} jobs in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    classifier = CentroidClassifier(threshold=args.threshold, min_similarity=args.min_similarity).fit_from_keywords(payloads, vectors)
+    old_labels = [payload.get('category') or "Other" for payload in payloads]
+    new_labels = classifier.classify(vectors, old_labels)
+    print(f"Classified {len(points)} jobs in {time.perf_counter() - start:.2f}s")
+
+    changes = Counter((old, new) for old, new in zip(old_labels, new_labels) if old != new)
+    print(f"{sum(changes.values())} jobs change category")
+    for (old, new), count in changes.most_common(15):
+        print(f"  {count:5d}  {old} -> {new}")
+
+    if args.save_centroids:
+        classifier.save(args.save_centroids)
+        print(f"Saved centroids to {args.save_centroids}")
+
+    if not args.apply:
+        return
+
+    # The vector does not embed the category, so a payload update is enough
+    point_ids_by_category = defaultdict(list)
+    for point, old, new in zip(points, old_labels, new_labels):
+        if old != new:
+            point_ids_by_category[new].append(point.id)
+    updated = qdrant.set_categories(point_ids_by_category)
+    print(f"Updated the category of {updated} points in Qdrant")
+
+    if args.db_path:
+        db = Database(args.db_path, performance=True)
+        updated = db.update_categories(
+            (payload['id'], new)
+            for payload, old, new in zip(payloads, old_labels, new_labels)
+            if old != new and payload.get('id')
+        )
+        db.close()
+        print(f"Updated {updated} SQLite rows")
+
+if __name__ == "__main__":
+    main()
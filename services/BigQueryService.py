@@ -1,7 +1,6 @@
 import os
 from google.cloud import bigquery
 import logging
-from fastembed import TextEmbedding
 import json
 from typing import List
 
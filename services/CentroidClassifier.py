@@ -0,0 +1,95 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from services.JobClassificationService import KeywordClassifier
+from services.vector_db.AbstractVectorDB import build_job_text
+
+class CentroidClassifier:
+    """
+    Nearest-centroid job categories over the 384-dim job embeddings.
+    Centroids are the normalised mean vector of each labelled category, so a
+    whole batch is labelled with one matrix multiply. Confidence is a softmax
+    over the cosine similarities; below `threshold`, or when the job is not within
+    `min_similarity` of any centroid, callers keep the keyword label.
+    """
+    def __init__(self, embedder=None, threshold: float = 0.5, temperature: float = 0.05,
+                 min_similarity: float = 0.6):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.min_similarity = min_similarity
+        self.temperature = temperature
+        self.labels: List[str] = []
+        self.centroids: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def fit(self, embeddings: Sequence[Sequence[float]], labels: Sequence[str]) -> "CentroidClassifier":
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        labels = np.asarray(labels)
+        # "Other" is the no-match bucket, not a topic, so it gets no centroid
+        self.labels = sorted(set(labels.tolist()) - {"Other"})
+        if not self.labels:
+            raise ValueError("Need at least one labelled category to fit centroids")
+        self.centroids = self._normalize(np.stack([vectors[labels == label].mean(axis=0) for label in self.labels]))
+        return self
+
+    def fit_from_keywords(self, jobs: Sequence[Dict[str, Any]], embeddings: Sequence[Sequence[float]],
+                          keyword_classifier: Optional[KeywordClassifier] = None) -> "CentroidClassifier":
+        """Seed centroids with the keyword classifier's labels for already embedded jobs."""
+        keyword_classifier = keyword_classifier or KeywordClassifier()
+        labels = keyword_classifier.classify_batch(
+            (job.get('title', ''), job.get('description', '')) for job in jobs
+        )
+        return self.fit(embeddings, labels)
+
+    def predict(self, embeddings: Sequence[Sequence[float]]) -> Tuple[List[str], np.ndarray]:
+        """Return the nearest category and its confidence for every row."""
+        labels, confidences, _ = self._predict(embeddings)
+        return labels, confidences
+
+    def _predict(self, embeddings: Sequence[Sequence[float]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        if self.centroids is None:
+            raise ValueError("CentroidClassifier is not fitted")
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        similarities = vectors @ self.centroids.T
+        logits = (similarities - similarities.max(axis=1, keepdims=True)) / self.temperature
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        rows = np.arange(len(best))
+        return [self.labels[i] for i in best], probabilities[rows, best], similarities[rows, best]
+
+    def classify(self, embeddings: Sequence[Sequence[float]], fallback_labels: Sequence[str]) -> List[str]:
+        """Centroid label where confident, otherwise the fallback (keyword) label."""
+        if len(fallback_labels) == 0:
+            return []
+        labels, confidences, similarities = self._predict(embeddings)
+        return [
+            label if confidence >= self.threshold and similarity >= self.min_similarity else fallback
+            for label, confidence, similarity, fallback in zip(labels, confidences, similarities, fallback_labels)
+        ]
+
+    def classify_jobs(self, jobs: Sequence[Dict[str, Any]]) -> List[str]:
+        """Embed job dicts with the configured embedder and classify them in one batch."""
+        if self.embedder is None:
+            raise ValueError("classify_jobs needs an embedder")
+        if not jobs:
+            return []
+        embeddings = self.embedder.embed_documents([build_job_text(job) for job in jobs])
+        return self.classify(embeddings, [job.get('category') or "Other" for job in jobs])
+
+    def save(self, path: str):
+        np.savez(path, labels=np.asarray(self.labels), centroids=self.centroids, threshold=self.threshold,
+                 temperature=self.temperature, min_similarity=self.min_similarity)
+
+    @classmethod
+    def load(cls, path: str, embedder=None) -> "CentroidClassifier":
+        data = np.load(path)
+        classifier = cls(embedder=embedder, threshold=float(data["threshold"]),
+                         temperature=float(data["temperature"]), min_similarity=float(data["min_similarity"]))
+        classifier.labels = data["labels"].tolist()
+        classifier.centroids = data["centroids"]
+        return classifier
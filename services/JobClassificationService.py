@@ -1,8 +1,10 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
 
 CATEGORY_KEYWORDS = {
     "AI/ML Engineer": ["machine learning", "deep learning", "llm", "ai", "neural", "pytorch", "tensorflow", "jax", "computer vision", "natural language processing"],
     "Data Engineer": ["pipeline", "etl", "airflow", "spark", "bigquery", "dbt", "kafka", "snowflake", "data warehouse", "sql"],
-    "Data Scientist": ["statistics", "analysis", "hypothesis", "experiment", "r ", "pandas", "scipy", "modeling", "insights"],
+    "Data Scientist": ["statistics", "analysis", "hypothesis", "experiment", "r", "pandas", "scipy", "modeling", "insights"],
     "Backend Engineer": ["backend", "django", "flask", "fastapi", "node.js", "golang", "elixir", "microservices", "ruby on rails", "java", "spring"],
     "Frontend/Full Stack Engineer": ["frontend", "react", "vue", "angular", "next.js", "css", "html", "typescript", "full stack", "web developer", "wordpress"],
     "DevOps/SRE": ["mlflow", "kubeflow", "model serving", "ci/cd", "deployment", "docker", "kubernetes", "terraform", "aws", "gcp", "azure", "infrastructure", "sre"],
@@ -13,17 +15,84 @@ CATEGORY_KEYWORDS = {
     "Healthcare": ["psychologist", "clinician", "nurse", "therapist", "healthcare", "clinical"],
 }
 
-def classify_category(title: str, description: str):
+# Optional per-keyword weights; keywords not listed count 1.0
+KEYWORD_WEIGHTS: Dict[str, float] = {}
+
+# Keywords found in the job title count this many times more than in the description
+TITLE_BOOST = 2.0
+
+# Plural suffix accepted after any keyword ("pipelines", "nurses", "taxes"), as the substring matcher did
+PLURAL_SUFFIX = r"(?:e?s)?"
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """
+    Build a regex from a character trie of the keywords, so shared prefixes are
+    tested once per position instead of once per keyword. Optional suffixes are
+    greedy, so the longest keyword that ends on a word boundary wins.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+class KeywordClassifier:
+    """
+    Precompiled multi-keyword matcher: one regex alternation over every keyword,
+    scanned once per document. Matches respect word boundaries, so "ai" no longer
+    hits "maintain", but allow a plural suffix. Each distinct keyword contributes
+    its weight once (boosted when it appears in the title); ties resolve in
+    CATEGORY_KEYWORDS order.
+    """
+    def __init__(self, category_keywords: Dict[str, List[str]] = CATEGORY_KEYWORDS,
+                 weights: Optional[Dict[str, float]] = None, title_boost: float = TITLE_BOOST):
+        self.categories = list(category_keywords)
+        self.weights = KEYWORD_WEIGHTS if weights is None else weights
+        self.title_boost = title_boost
+
+        self.keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in category_keywords.items():
+            for keyword in keywords:
+                self.keyword_categories.setdefault(keyword.strip().lower(), []).append(category)
 
-    title = title or ""
-    description = description or ""
-    text = f"{title} {description}".lower()
-   
-    scores = {
-     category: sum(1 for kw in keywords if kw in text) 
-     for category, keywords in CATEGORY_KEYWORDS.items()
-     }
-    
-    best_match = max(scores, key=scores.get)
-
-    return best_match if scores[best_match] > 0 else "Other"
+        # The only capturing group is the keyword itself, so findall returns it without the suffix
+        self.pattern = re.compile(rf"(?<!\w)({_trie_regex(self.keyword_categories)}){PLURAL_SUFFIX}(?!\w)")
+
+    def score(self, title: str, description: str) -> Dict[str, float]:
+        title_matches = set(self.pattern.findall((title or "").lower()))
+        matches = title_matches | set(self.pattern.findall((description or "").lower()))
+
+        scores = dict.fromkeys(self.categories, 0.0)
+        for keyword in matches:
+            weight = self.weights.get(keyword, 1.0)
+            if keyword in title_matches:
+                weight *= self.title_boost
+            for category in self.keyword_categories[keyword]:
+                scores[category] += weight
+        return scores
+
+    def classify(self, title: str, description: str) -> str:
+        scores = self.score(title, description)
+        best_match = max(scores, key=scores.get)
+        return best_match if scores[best_match] > 0 else "Other"
+
+    def classify_batch(self, jobs: Iterable[Tuple[str, str]]) -> List[str]:
+        """Classify (title, description) pairs."""
+        return [self.classify(title, description) for title, description in jobs]
+
+_default_classifier = KeywordClassifier()
+
+def classify_category(title: str, description: str):
+    return _default_classifier.classify(title, description)
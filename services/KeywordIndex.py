@@ -0,0 +1,158 @@
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .vector_db.AbstractVectorDB import build_job_payload
+
+# Keeps "c++", "c#", "node.js" and "3.11" whole; hyphens split, so "full-stack" matches "full stack"
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to we will with you your"
+    " find me jobs job looking role roles position positions".split()
+)
+# Term frequency multipliers per field (a simple BM25F): a match in the title counts three times
+FIELD_WEIGHTS = {"title": 3, "company": 2, "description": 1}
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+class KeywordIndex:
+    """
+    Local BM25 inverted index over job title, company and description.
+    Postings live in a standalone SQLite file (term, doc, weighted tf), so the index
+    is updated incrementally as jobs are embedded and can be shipped next to the app.
+    Each entry also keeps the vector store payload, so keyword-only hits can be
+    returned without a second lookup.
+    """
+    def __init__(self, path: str = './data/keyword_index.db', k1: float = 1.2, b: float = 0.75):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        # Streamlit sessions and the embedding writer share one connection behind a lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY,
+                job_id TEXT NOT NULL UNIQUE,
+                length INTEGER NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_doc_id ON postings(doc_id);
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def term_frequencies(job: Dict[str, Any]) -> Counter:
+        frequencies = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(job.get(field)):
+                frequencies[token] += weight
+        return frequencies
+
+    def add_jobs(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """Index or re-index jobs (dicts with an id) in one transaction; returns how many."""
+        rows = [(job["id"], self.term_frequencies(job), json.dumps(build_job_payload(job))) for job in jobs]
+        if not rows:
+            return 0
+        with self._lock, self.conn:
+            for job_id, frequencies, payload in rows:
+                length = sum(frequencies.values())
+                existing = self.conn.execute("SELECT doc_id FROM docs WHERE job_id = ?", (job_id,)).fetchone()
+                if existing:
+                    doc_id = existing[0]
+                    self.conn.execute("UPDATE docs SET length = ?, payload = ? WHERE doc_id = ?",
+                                      (length, payload, doc_id))
+                    self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                else:
+                    doc_id = self.conn.execute("INSERT INTO docs (job_id, length, payload) VALUES (?, ?, ?)",
+                                               (job_id, length, payload)).lastrowid
+                self.conn.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                                      [(term, doc_id, tf) for term, tf in frequencies.items()])
+        return len(rows)
+
+    def indexed_ids(self) -> set:
+        with self._lock:
+            return {row[0] for row in self.conn.execute("SELECT job_id FROM docs")}
+
+    def backfill(self, db, chunk_size: int = 500) -> int:
+        """
+        Index embedded jobs of `db` that the index does not have yet, e.g. on first use.
+        A no-op unless the index holds fewer jobs than `db` has embedded, so the
+        full scan only happens when the index is new or has fallen behind.
+        """
+        embedded = db.conn.execute("SELECT COUNT(*) FROM jobs WHERE has_embedded = TRUE").fetchone()[0]
+        if len(self) >= embedded:
+            return 0
+        indexed = self.indexed_ids()
+        cursor = db.conn.execute("SELECT * FROM jobs WHERE has_embedded = TRUE")
+        added = 0
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return added
+            added += self.add_jobs([dict(row) for row in rows if row["id"] not in indexed])
+
+    def search(self, query: str, k: int = 20) -> List[Tuple[Dict[str, Any], float]]:
+        """Top-k (payload, BM25 score) for the query terms, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        placeholders = ", ".join("?" * len(terms))
+        with self._lock:
+            total, average_length = self.conn.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+            postings = self.conn.execute(
+                f'''
+                SELECT p.term, p.doc_id, p.tf, d.length FROM postings p
+                JOIN docs d ON d.doc_id = p.doc_id
+                WHERE p.term IN ({placeholders})
+                ''',
+                terms
+            ).fetchall()
+        if not postings:
+            return []
+
+        document_frequency = Counter(term for term, _, _, _ in postings)
+        scores: Dict[int, float] = {}
+        for term, doc_id, tf, length in postings:
+            df = document_frequency[term]
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            norm = tf + self.k1 * (1 - self.b + self.b * length / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        with self._lock:
+            payloads = dict(self.conn.execute(
+                f"SELECT doc_id, payload FROM docs WHERE doc_id IN ({', '.join('?' * len(top))})",
+                [doc_id for doc_id, _ in top]
+            ).fetchall())
+        return [(json.loads(payloads[doc_id]), score) for doc_id, score in top]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            docs = self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+            terms = self.conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {"indexed_jobs": docs, "terms": terms}
+
+    def close(self):
+        self.conn.close()
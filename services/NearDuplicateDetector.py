@@ -0,0 +1,205 @@
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import generate_job_id
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+WORD_RE = re.compile(r"\w+")
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles of a job's cleaned text.
+    Shingles are hashed with crc32 (stable across processes, unlike hash()) and
+    permuted with num_perm universal hash functions in one numpy broadcast.
+    The seed fixes the permutations, so signatures stay comparable across runs.
+    """
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set:
+        tokens = WORD_RE.findall(text.lower())
+        if len(tokens) <= self.shingle_size:
+            return {" ".join(tokens)} if tokens else set()
+        return {" ".join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self.shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        # (a * x + b) mod p, truncated to 32 bits; uint64 overflow wraps, which keeps it a valid hash family
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def similarity(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+        return float(np.mean(signature_a == signature_b))
+
+def _job_fields(job) -> Tuple[str, Optional[str], str, str]:
+    """(id, url, title, shingled text) for a Job, JobRecord or SQLite row dict."""
+    if isinstance(job, dict):
+        job_id, title, company, description, url = (
+            job["id"], job.get("title"), job.get("company"), job.get("description"), job.get("url"))
+    else:
+        job_id = getattr(job, "id", None) or generate_job_id(job.description)
+        title, company, description, url = job.title, job.company, job.description, job.url
+    return job_id, str(url) if url else None, title or "", f"{company or ''} {description or ''}"
+
+def titles_match(title_a: str, title_b: str) -> bool:
+    """
+    One title's words contain the other's ("Senior Sales Engineer" vs "... (Remote)").
+    Keeps per-language or per-level variants that share a boilerplate description apart.
+    """
+    words_a, words_b = set(WORD_RE.findall(title_a.lower())), set(WORD_RE.findall(title_b.lower()))
+    return words_a <= words_b or words_b <= words_a
+
+@dataclass
+class DedupResult:
+    """Split of a batch into canonical jobs and near-duplicates of an indexed or earlier job."""
+    unique: List[Any] = field(default_factory=list)
+    duplicates: List[Tuple[Any, str, float]] = field(default_factory=list)   # (job, canonical id, similarity)
+    fingerprints: Dict[str, Tuple[str, np.ndarray]] = field(default_factory=dict)  # canonical id -> (title, signature)
+
+class NearDuplicateDetector:
+    """
+    MinHash/LSH near-duplicate detection for jobs, indexed in the jobs SQLite DB
+    (job_minhash, job_lsh_buckets and job_duplicates, created by Database).
+    Signatures are split into `bands` bands; two jobs become candidates when any band
+    hashes to the same bucket, and a candidate is a duplicate when the estimated
+    Jaccard similarity of company + description reaches `threshold` and the titles match.
+    With 128 permutations and 16 bands of 8 rows the candidate curve rises around 0.7,
+    just below the default threshold.
+    """
+    def __init__(self, db, threshold: float = 0.85, bands: int = 16, hasher: Optional[MinHasher] = None):
+        self.db = db
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError(f"num_perm={self.hasher.num_perm} is not divisible by bands={bands}")
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+
+    def _bucket_keys(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        keys = []
+        for band in range(self.bands):
+            digest = hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8)
+            keys.append((band, int.from_bytes(digest.digest(), "big", signed=True)))
+        return keys
+
+    def _indexed_candidates(self, keys: List[Tuple[int, int]]) -> Dict[str, Tuple[str, np.ndarray]]:
+        values = ", ".join("(?, ?)" for _ in keys)
+        cursor = self.db.conn.execute(
+            f'''
+            SELECT DISTINCT b.job_id, m.title, m.signature
+            FROM job_lsh_buckets b JOIN job_minhash m ON m.job_id = b.job_id
+            WHERE (b.band, b.bucket) IN (VALUES {values})
+            ''',
+            [value for key in keys for value in key]
+        )
+        return {row[0]: (row[1] or "", np.frombuffer(row[2], dtype=np.uint32)) for row in cursor}
+
+    def deduplicate(self, jobs: Sequence[Any]) -> DedupResult:
+        """
+        Split a batch (Job, JobRecord or row dicts) before insert. Jobs are compared with
+        the index and with earlier canonical jobs of the same batch; exact re-scrapes
+        (same id) are left to INSERT OR IGNORE.
+        """
+        result = DedupResult()
+        batch_buckets: Dict[Tuple[int, int], List[str]] = {}
+
+        for job in jobs:
+            job_id, _, title, text = _job_fields(job)
+            signature = self.hasher.signature(text)
+            keys = self._bucket_keys(signature)
+
+            candidates = self._indexed_candidates(keys)
+            for key in keys:
+                for candidate_id in batch_buckets.get(key, ()):
+                    candidates[candidate_id] = result.fingerprints[candidate_id]
+            candidates.pop(job_id, None)
+
+            best_id, best_similarity = None, 0.0
+            for candidate_id, (candidate_title, candidate_signature) in candidates.items():
+                similarity = MinHasher.similarity(signature, candidate_signature)
+                if similarity > best_similarity and titles_match(title, candidate_title):
+                    best_id, best_similarity = candidate_id, similarity
+
+            if best_id is not None and best_similarity >= self.threshold:
+                result.duplicates.append((job, best_id, best_similarity))
+                continue
+
+            result.unique.append(job)
+            result.fingerprints[job_id] = (title, signature)
+            for key in keys:
+                batch_buckets.setdefault(key, []).append(job_id)
+        return result
+
+    def index(self, result: DedupResult):
+        """Persist signatures of the canonical jobs and the duplicate mapping in one transaction."""
+        detected_at = datetime.now().isoformat()
+        with self.db.conn:
+            self.db.conn.executemany(
+                "INSERT OR IGNORE INTO job_minhash (job_id, title, signature) VALUES (?, ?, ?)",
+                [(job_id, title, signature.tobytes()) for job_id, (title, signature) in result.fingerprints.items()]
+            )
+            self.db.conn.executemany(
+                "INSERT OR IGNORE INTO job_lsh_buckets (band, bucket, job_id) VALUES (?, ?, ?)",
+                [(band, bucket, job_id)
+                 for job_id, (_, signature) in result.fingerprints.items()
+                 for band, bucket in self._bucket_keys(signature)]
+            )
+            duplicate_rows = []
+            for job, canonical_id, similarity in result.duplicates:
+                job_id, url, _, _ = _job_fields(job)
+                duplicate_rows.append((job_id, canonical_id, url, similarity, detected_at))
+            self.db.conn.executemany(
+                '''
+                INSERT OR REPLACE INTO job_duplicates (job_id, canonical_id, url, similarity, detected_at)
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                duplicate_rows
+            )
+
+    def backfill(self, chunk_size: int = 500) -> Dict[str, int]:
+        """
+        Index stored jobs that have no signature yet, oldest first so the earliest
+        posting stays canonical. Duplicates found here are already in `jobs`; recording
+        them drops the pending ones from the embedding backlog.
+        """
+        counts = {"indexed": 0, "duplicates": 0}
+        while True:
+            cursor = self.db.conn.execute(
+                '''
+                SELECT id, title, company, description, url FROM jobs
+                WHERE id NOT IN (SELECT job_id FROM job_minhash)
+                AND id NOT IN (SELECT job_id FROM job_duplicates)
+                ORDER BY scraped_at, id
+                LIMIT ?
+                ''',
+                (chunk_size,)
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
+            if not rows:
+                return counts
+            result = self.deduplicate(rows)
+            self.index(result)
+            counts["indexed"] += len(result.unique)
+            counts["duplicates"] += len(result.duplicates)
+
+    def stats(self) -> Dict[str, int]:
+        signatures = self.db.conn.execute("SELECT COUNT(*) FROM job_minhash").fetchone()[0]
+        duplicates = self.db.conn.execute("SELECT COUNT(*) FROM job_duplicates").fetchone()[0]
+        return {"indexed_jobs": signatures, "near_duplicates": duplicates}
@@ -0,0 +1,25 @@
+from abc import abstractmethod
+from typing import List
+from langchain_core.embeddings import Embeddings
+
+class AbstractEmbedder(Embeddings):
+    """
+    Embedding backend shared by the vector services.
+    Subclasses LangChain's Embeddings so it can be passed straight to Chroma.
+    """
+    model_id: str
+    dimension: int
+
+    @abstractmethod
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of documents."""
+        pass
+
+    @abstractmethod
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single search query."""
+        pass
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several search queries; backends override this to use a single call."""
+        return [self.embed_query(text) for text in texts]
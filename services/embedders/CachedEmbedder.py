@@ -0,0 +1,55 @@
+from typing import Dict, List
+from .AbstractEmbedder import AbstractEmbedder
+from .EmbeddingCache import EmbeddingCache
+
+class CachedEmbedder(AbstractEmbedder):
+    """
+    Wraps another embedder so every call is served from the embedding cache first.
+    Only cache misses reach the wrapped backend, in a single batched call.
+    """
+    def __init__(self, embedder: AbstractEmbedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        self.model_id = embedder.model_id
+        self.dimension = embedder.dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [EmbeddingCache.make_key(self.model_id, text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        if missing:
+            vectors = self.embedder.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(computed.items())
+            cached.update(computed)
+
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        # Queries may be embedded differently from documents, so keep them in their own key space
+        keys = [EmbeddingCache.make_key(f"{self.model_id}:query", text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        if missing:
+            vectors = self.embedder.embed_queries(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(computed.items())
+            cached.update(computed)
+
+        return [cached[key] for key in keys]
+
+    def stats(self) -> Dict[str, float]:
+        return self.cache.stats()
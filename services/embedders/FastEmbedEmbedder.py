@@ -0,0 +1,28 @@
+from typing import List, Optional
+from fastembed import TextEmbedding
+from .AbstractEmbedder import AbstractEmbedder
+
+class FastEmbedEmbedder(AbstractEmbedder):
+    """
+    Local in-process embeddings with fastembed (ONNX Runtime on CPU).
+    Same bge-small model as the remote backend, so vectors stay compatible
+    with existing collections.
+    """
+    def __init__(self, model_id: str = "BAAI/bge-small-en-v1.5", dimension: int = 384,
+                 batch_size: int = 64, threads: Optional[int] = None, parallel: Optional[int] = None):
+        self.model_id = model_id
+        self.dimension = dimension
+        self.batch_size = batch_size
+        # threads: ONNX intra-op threads; parallel: data-parallel worker processes (None = in-process)
+        self.parallel = parallel
+        self.model = TextEmbedding(model_name=model_id, threads=threads)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.embed(texts, batch_size=self.batch_size, parallel=self.parallel)
+        return [vector.tolist() for vector in vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        return next(iter(self.model.query_embed(text))).tolist()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return [vector.tolist() for vector in self.model.query_embed(texts)]
@@ -0,0 +1,23 @@
+import os
+from typing import List
+from langchain_huggingface import HuggingFaceEndpointEmbeddings
+from .AbstractEmbedder import AbstractEmbedder
+
+class HuggingFaceEmbedder(AbstractEmbedder):
+    """Remote embeddings through the HuggingFace inference endpoint."""
+    def __init__(self, model_id: str = "BAAI/bge-small-en-v1.5", dimension: int = 384):
+        self.model_id = model_id
+        self.dimension = dimension
+        self.client = HuggingFaceEndpointEmbeddings(
+            model=model_id,
+            huggingfacehub_api_token=os.getenv('HF_TOKEN'))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.client.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.client.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        # The endpoint embeds queries and documents the same way, so batch them in one request
+        return self.client.embed_documents(texts)
@@ -0,0 +1,31 @@
+import os
+from typing import Optional
+from .AbstractEmbedder import AbstractEmbedder
+from .HuggingFaceEmbedder import HuggingFaceEmbedder
+from .FastEmbedEmbedder import FastEmbedEmbedder
+from .EmbeddingCache import EmbeddingCache
+from .CachedEmbedder import CachedEmbedder
+
+EMBEDDERS = {
+    "huggingface": HuggingFaceEmbedder,
+    "fastembed": FastEmbedEmbedder,
+}
+
+def get_embedder(backend: Optional[str] = None, cache_path: Optional[str] = None, **kwargs) -> AbstractEmbedder:
+    """
+    Build the embedder named by `backend` or the EMBEDDING_BACKEND env var (default: huggingface).
+    When `cache_path` or EMBEDDING_CACHE_PATH is set, wrap it with the persistent embedding cache.
+    """
+    backend = (backend or os.getenv('EMBEDDING_BACKEND', 'huggingface')).lower()
+    if backend not in EMBEDDERS:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected one of {list(EMBEDDERS)}")
+    embedder = EMBEDDERS[backend](**kwargs)
+
+    cache_path = cache_path or os.getenv('EMBEDDING_CACHE_PATH')
+    if cache_path:
+        max_entries = int(os.getenv('EMBEDDING_CACHE_MAX_ENTRIES', '100000'))
+        embedder = CachedEmbedder(embedder, EmbeddingCache(cache_path, max_entries=max_entries))
+    return embedder
+
+__all__ = ["AbstractEmbedder", "HuggingFaceEmbedder", "FastEmbedEmbedder", "EmbeddingCache",
+           "CachedEmbedder", "EMBEDDERS", "get_embedder"]
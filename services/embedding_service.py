@@ -1,15 +1,39 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
 from .vector_db.AbstractVectorDB import AbstractVectorDB
 
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least 1/rate seconds apart."""
+    def __init__(self, requests_per_second: Optional[float] = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 class EmbeddingService:
     """
     Service for sync sqlite -> vector database
+    With a keyword_index, every upserted chunk is also added to the BM25 index
+    before it is checkpointed, so both stores cover the same jobs.
     """
-    def __init__(self, db, vector_db: AbstractVectorDB):
+    def __init__(self, db, vector_db: AbstractVectorDB, keyword_index=None):
         self.sql_db = db
         self.vector_db = vector_db
+        self.keyword_index = keyword_index
         print("✅ EmbeddingService ready")
-    
+
     def sync_embeddings(self, batch_size: Optional[int]) -> Dict:
         jobs = self.sql_db.get_jobs_without_embedding(batch_size)
 
@@ -22,24 +46,145 @@ class EmbeddingService:
         try:
             # Native vector services (ChromaService, QdrantService) expect a list of dicts
             # and return a list of successfully added IDs
-            success_ids = self.vector_db.add_jobs(jobs)
-            
-            for job_id in success_ids:
-                self.sql_db.mark_as_embedded(job_id)
-            
-            success_count = len(success_ids)
+            success_count = self._embed_chunk(jobs)
             failed_count = len(jobs) - success_count
-            
+
         except Exception as e:
             print(f"❌ Error during batch sync: {e}")
             success_count = 0
             failed_count = len(jobs)
 
+        self._print_summary(success_count, failed_count)
+
+        return {"success": success_count, "failed": failed_count}
+
+    def sync_embeddings_streaming(self, chunk_size: int = 64, max_jobs: Optional[int] = None) -> Dict:
+        """
+        Embed the backlog chunk by chunk: read a page, embed + upsert it, then
+        checkpoint its SQLite flags before reading the next page.
+        Memory stays bounded by chunk_size and a failure only loses the current chunk.
+        """
+        success_count = 0
+        failed_count = 0
+        chunk_count = 0
+
+        with self.vector_db.batch_writes():
+            for jobs in self.sql_db.iter_jobs_without_embedding(chunk_size):
+                if max_jobs is not None:
+                    remaining = max_jobs - success_count - failed_count
+                    if remaining <= 0:
+                        break
+                    jobs = jobs[:remaining]
+
+                chunk_count += 1
+                try:
+                    chunk_success = self._embed_chunk(jobs)
+                except Exception as e:
+                    print(f"❌ Error in chunk {chunk_count}: {e}")
+                    chunk_success = 0
+
+                success_count += chunk_success
+                failed_count += len(jobs) - chunk_success
+                print(f"Chunk {chunk_count}: {chunk_success}/{len(jobs)} embedded "
+                      f"({success_count} total so far)")
+
+        if chunk_count == 0:
+            print("No jobs to embed")
+            return {"success": 0, "failed": 0}
+
+        self._print_summary(success_count, failed_count)
+
+        return {"success": success_count, "failed": failed_count, "chunks": chunk_count}
+
+    def sync_embeddings_pipelined(self, chunk_size: int = 32, concurrency: int = 4,
+                                  requests_per_second: Optional[float] = None,
+                                  max_jobs: Optional[int] = None) -> Dict:
+        """
+        Overlap embedding inference with vector DB writes.
+        The calling thread reads backlog pages and writes upserts + checkpoints,
+        while a pool of `concurrency` workers calls the embedding endpoint.
+        At most 2 * concurrency chunks are read ahead, which bounds memory and
+        applies backpressure to the reader when the writer falls behind.
+        """
+        limiter = RateLimiter(requests_per_second)
+        max_in_flight = 2 * concurrency
+        in_flight = deque()
+        results = {"success": 0, "failed": 0, "chunks": 0}
+        started = time.monotonic()
+
+        def embed(jobs):
+            limiter.wait()
+            return self.vector_db.create_embeddings(jobs)
+
+        def write_oldest():
+            jobs, future = in_flight.popleft()
+            results["chunks"] += 1
+            try:
+                embeddings = future.result()
+                success_ids = self.vector_db.upsert_embeddings(jobs, embeddings)
+                self._index_keywords(jobs, success_ids)
+                chunk_success = len(self.sql_db.mark_many_as_embedded(success_ids))
+            except Exception as e:
+                print(f"❌ Error in chunk {results['chunks']}: {e}")
+                chunk_success = 0
+            results["success"] += chunk_success
+            results["failed"] += len(jobs) - chunk_success
+
+        read_count = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as pool, self.vector_db.batch_writes():
+            # The keyset cursor keeps read-ahead pages disjoint even before they are marked
+            for jobs in self.sql_db.iter_jobs_without_embedding(chunk_size):
+                if max_jobs is not None:
+                    jobs = jobs[:max_jobs - read_count]
+                    if not jobs:
+                        break
+                read_count += len(jobs)
+
+                in_flight.append((jobs, pool.submit(embed, jobs)))
+                if len(in_flight) >= max_in_flight:
+                    write_oldest()
+
+            while in_flight:
+                write_oldest()
+
+        if results["chunks"] == 0:
+            print("No jobs to embed")
+            return {"success": 0, "failed": 0}
+
+        elapsed = time.monotonic() - started
+        print(f"Pipelined sync: {read_count} jobs in {elapsed:.1f}s "
+              f"({read_count / elapsed:.1f} jobs/s, concurrency={concurrency})")
+        self._print_summary(results["success"], results["failed"])
+
+        return results
+
+    def _embed_chunk(self, jobs: List[Dict]) -> int:
+        """Upsert one chunk into the vector store and checkpoint it in SQLite."""
+        success_ids = self.vector_db.add_jobs(jobs)
+        self._index_keywords(jobs, success_ids)
+
+        # One UPDATE ... WHERE id IN (...) per chunk, committed as a single transaction
+        marked_ids = self.sql_db.mark_many_as_embedded(success_ids)
+        unmarked_ids = set(success_ids) - marked_ids
+        if unmarked_ids:
+            print(f"⚠️ {len(unmarked_ids)} upserted jobs were not found in SQLite")
+
+        return len(marked_ids)
+
+    def _index_keywords(self, jobs: List[Dict], success_ids: List[str]):
+        # Raising here leaves the chunk unmarked, so it is retried on the next sync
+        if self.keyword_index is not None:
+            upserted = set(success_ids)
+            self.keyword_index.add_jobs([job for job in jobs if job['id'] in upserted])
+
+    def _print_summary(self, success_count: int, failed_count: int):
+        total = success_count + failed_count
+
         print("\n" + "=" * 60)
         print("Sync Complete!")
         print("=" * 60)
-        print(f"✅ Success: {success_count}/{len(jobs)}")
-        print(f"❌ Failed: {failed_count}/{len(jobs)}")
+        print(f"✅ Success: {success_count}/{total}")
+        print(f"❌ Failed: {failed_count}/{total}")
 
         stats = self.sql_db.get_stats()
         vector_stats = self.vector_db.get_stats()
@@ -51,5 +196,3 @@ class EmbeddingService:
         # Handle different stat formats between Qdrant and others
         count = vector_stats.get('total_points') or vector_stats.get('total_embeddings', 0)
         print(f"   VectorDB total: {count}")
-        
-        return {"success": success_count, "failed": failed_count}
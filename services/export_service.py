@@ -0,0 +1,121 @@
+import gzip
+import io
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional
+
+from models import JobRecord
+from utils import atomic_write
+
+# Suffix -> format; "json" is a single array (what scripts/seed_db.py reads), the others one job per line
+EXPORT_FORMATS = {
+    ".ndjson.gz": "ndjson.gz",
+    ".jsonl.gz": "ndjson.gz",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "json",
+}
+
+def infer_format(path: str) -> str:
+    for suffix, export_format in EXPORT_FORMATS.items():
+        if path.endswith(suffix):
+            return export_format
+    raise ValueError(f"Cannot infer export format from '{path}', expected one of {', '.join(EXPORT_FORMATS)}")
+
+class ExportService:
+    """
+    Export the jobs table from SQLite without materialising it.
+    Rows stream from a fetchmany cursor straight into the output file (one json.dumps
+    per row), the file is written to a temp path and renamed into place, and
+    incremental exports only read rows changed since the stored watermark.
+    """
+    def __init__(self, db, chunk_size: int = 1000, overlap: float = 3600):
+        self.db = db
+        self.chunk_size = chunk_size
+        # Seconds the incremental watermark trails the read: rows are stamped at scrape or
+        # embed time but only become visible when their transaction commits
+        self.overlap = overlap
+
+    def export(self, path: str, export_format: Optional[str] = None, changed_since: Optional[str] = None,
+               keep: Optional[Callable[[JobRecord], bool]] = None) -> Dict:
+        """Write every job (or those changed since `changed_since`, and passing `keep`) to `path` atomically."""
+        export_format = export_format or infer_format(path)
+        started = time.perf_counter()
+        stats = {"path": path, "rows": 0}
+
+        def lines() -> Iterator[str]:
+            for row in self.db.iter_jobs(changed_since, self.chunk_size):
+                record = JobRecord.from_row(row)
+                if keep is not None and not keep(record):
+                    continue
+                stats["rows"] += 1
+                yield record.to_json()
+
+        if export_format == "ndjson.gz":
+            with atomic_write(path, 'wb') as raw:
+                # mtime=0 keeps the archive byte-identical for identical content
+                with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0) as compressed:
+                    with io.TextIOWrapper(compressed, encoding="utf-8") as f:
+                        self._write_lines(f, lines())
+        elif export_format == "ndjson":
+            with atomic_write(path, 'w', encoding="utf-8") as f:
+                self._write_lines(f, lines())
+        elif export_format == "json":
+            with atomic_write(path, 'w', encoding="utf-8") as f:
+                f.write("[")
+                for index, line in enumerate(lines()):
+                    f.write(", " + line if index else line)
+                f.write("]")
+        else:
+            raise ValueError(f"Unsupported export format '{export_format}'")
+
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+
+    def export_incremental(self, name: str, directory: str, export_format: str = "ndjson.gz") -> Dict:
+        """
+        Export rows scraped or embedded since the last run of export `name` to a new
+        timestamped file in `directory`, then advance the watermark. Nothing is
+        written when no row changed. Category-only updates carry no timestamp and
+        are not picked up.
+
+        The new watermark is taken before the read and trails it by `overlap`
+        seconds, so a row stamped earlier but committed after the read is still
+        above it next time. Rows re-read inside that window are skipped by id
+        unless they changed again.
+        """
+        since = self.db.get_export_watermark(name)
+        exported = self.db.get_export_overlap(name)
+        watermark = (datetime.now() - timedelta(seconds=self.overlap)).isoformat()
+        if since is not None and since > watermark:
+            watermark = since
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(directory, f"{name}-{stamp}.{export_format}")
+
+        # Every row read above the new watermark, exported now or by an earlier run
+        overlap = {}
+
+        def keep(record: JobRecord) -> bool:
+            changed_at = max(record.scraped_at or "", record.embedded_at or "")
+            if changed_at > watermark:
+                overlap[record.id] = changed_at
+            return exported.get(record.id) != changed_at
+
+        stats = self.export(path, export_format, changed_since=since, keep=keep)
+        stats["watermark"] = since
+        if stats["rows"] == 0:
+            os.unlink(path)
+            stats["path"] = None
+            return stats
+
+        # Only advance after the file is in place, so a failed run re-exports the same rows
+        self.db.set_export_watermark(name, watermark, overlap)
+        stats["watermark"] = watermark
+        return stats
+
+    @staticmethod
+    def _write_lines(f, lines: Iterator[str]):
+        for line in lines:
+            f.write(line)
+            f.write("\n")
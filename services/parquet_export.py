@@ -0,0 +1,145 @@
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from models import JobRecord
+
+logger = logging.getLogger(__name__)
+
+# BigQuery schema of jobpulse.jobs / jobs_staging; the Parquet files are written to match it
+JOBS_SCHEMA_FIELDS = [
+    {"name": "id", "type": "STRING", "mode": "REQUIRED"},
+    {"name": "title", "type": "STRING", "mode": "REQUIRED"},
+    {"name": "company", "type": "STRING", "mode": "REQUIRED"},
+    {"name": "description", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "url", "type": "STRING", "mode": "REQUIRED"},
+    {"name": "location", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "posted_date", "type": "TIMESTAMP", "mode": "NULLABLE"},
+    {"name": "scraped_at", "type": "TIMESTAMP", "mode": "REQUIRED"},
+    {"name": "has_embedded", "type": "BOOLEAN", "mode": "NULLABLE"},
+    {"name": "embedded_at", "type": "TIMESTAMP", "mode": "NULLABLE"},
+    {"name": "category", "type": "STRING", "mode": "NULLABLE"},
+]
+
+# TIMESTAMP -> INT64 TIMESTAMP_MICROS adjusted to UTC, which BigQuery loads as TIMESTAMP
+BIGQUERY_TO_ARROW = {
+    "STRING": pa.string(),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "BOOLEAN": pa.bool_(),
+    "INTEGER": pa.int64(),
+    "FLOAT": pa.float64(),
+}
+
+def arrow_schema(schema_fields: List[Dict[str, str]] = JOBS_SCHEMA_FIELDS) -> pa.Schema:
+    return pa.schema([
+        pa.field(field["name"], BIGQUERY_TO_ARROW[field["type"]], nullable=field.get("mode") != "REQUIRED")
+        for field in schema_fields
+    ])
+
+def _to_utc(value) -> Optional[datetime]:
+    """ISO string or datetime -> aware UTC datetime; naive values are taken as UTC like the JSON load did."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+class ParquetJobWriter:
+    """
+    Stream JobRecords into a compressed Parquet file with the BigQuery jobs schema.
+    Rows are buffered column-wise and written as one row group per `row_group_size`
+    rows, so memory stays bounded by the row group, not by the batch.
+    Records missing a REQUIRED value are counted in `rejected` instead of failing the load.
+    """
+    def __init__(self, path: str, schema_fields: List[Dict[str, str]] = JOBS_SCHEMA_FIELDS,
+                 row_group_size: int = 10000, compression: str = "zstd"):
+        self.path = path
+        self.schema = arrow_schema(schema_fields)
+        self.row_group_size = row_group_size
+        self._timestamps = {field["name"] for field in schema_fields if field["type"] == "TIMESTAMP"}
+        self._required = [field["name"] for field in schema_fields if field.get("mode") == "REQUIRED"]
+        self._columns: Dict[str, List[Any]] = {name: [] for name in self.schema.names}
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self.rows = 0
+        self.rejected: List[str] = []
+
+    def write(self, record: JobRecord):
+        row = record.to_dict()
+        if any(row.get(name) in (None, "") for name in self._required):
+            self.rejected.append(row.get("id") or "<no id>")
+            return
+        for name, column in self._columns.items():
+            value = row.get(name)
+            column.append(_to_utc(value) if name in self._timestamps else value)
+        self.rows += 1
+        if len(self._columns[self.schema.names[0]]) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[JobRecord]):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if not self._columns[self.schema.names[0]]:
+            return
+        arrays = [pa.array(self._columns[field.name], type=field.type) for field in self.schema]
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self._columns = {name: [] for name in self.schema.names}
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def upload_parquet_parts(records: Iterable[JobRecord], hook, bucket_name: str, prefix: str,
+                         rows_per_part: int = 100000, chunk_size: int = 8 * 1024 * 1024,
+                         row_group_size: int = 10000, compression: str = "zstd") -> List[str]:
+    """
+    Write records into Parquet part files of at most `rows_per_part` rows and upload
+    each part as soon as it is closed, with a resumable upload in `chunk_size` pieces.
+    `hook` only needs GCSHook.upload(bucket_name, object_name, filename=..., chunk_size=...).
+    Returns the uploaded object names (source_objects for a PARQUET load).
+    """
+    object_names = []
+    records = iter(records)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        while True:
+            part_path = os.path.join(tmp_dir, f"part-{len(object_names):05d}.parquet")
+            with ParquetJobWriter(part_path, row_group_size=row_group_size, compression=compression) as writer:
+                for record in records:
+                    writer.write(record)
+                    if writer.rows >= rows_per_part:
+                        break
+            if writer.rejected:
+                logger.warning(f"Skipped {len(writer.rejected)} jobs missing required fields: {writer.rejected[:5]}")
+            # The first part is uploaded even when empty so the load sees an empty table, not a missing file
+            if writer.rows == 0 and object_names:
+                break
+
+            object_name = f"{prefix}-{len(object_names):05d}.parquet"
+            size = os.path.getsize(part_path)
+            logger.info(f"Uploading {writer.rows} jobs ({size / 1024:.0f} KB) to gs://{bucket_name}/{object_name}")
+            hook.upload(
+                bucket_name=bucket_name,
+                object_name=object_name,
+                filename=part_path,
+                mime_type="application/vnd.apache.parquet",
+                chunk_size=chunk_size,
+            )
+            object_names.append(object_name)
+            os.unlink(part_path)
+            if writer.rows < rows_per_part:
+                break
+    return object_names
@@ -1,5 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from typing import List, Dict, Any, Tuple
+
+from models import TRACKING_FIELDS
+
+# No category: it is derived from this text (keyword rules, then centroids over its vector),
+# so embedding it would feed the label back into the classifier and go stale on relabelling
+JOB_TEXT_FIELDS = ("title", "company", "description", "location", "posted_date", "url")
+
+def build_job_text(job: Dict[str, Any]) -> str:
+    """Document text embedded for a job; shared so identical jobs hash to the same cache key."""
+    return "\n".join(str(job.get(field, "")) for field in JOB_TEXT_FIELDS).strip()
+
+def build_job_payload(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Vector store payload for a job row: JSON-safe scalars, without tracking fields."""
+    return {
+        key: value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+        for key, value in job.items()
+        if key not in TRACKING_FIELDS
+    }
 
 class AbstractVectorDB(ABC):
     @abstractmethod
@@ -12,12 +31,33 @@ class AbstractVectorDB(ABC):
         """Add a list of jobs (dictionaries) to the vector database (batch). Returns list of IDs."""
         pass
 
+    @abstractmethod
+    def upsert_embeddings(self, jobs: List[Dict[str, Any]], embeddings: List[List[float]]) -> List[str]:
+        """Write jobs with precomputed embedding vectors (batch). Returns list of IDs; raises on failure."""
+        pass
+
     @abstractmethod
     def search(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """Search for jobs based on a query string."""
         pass
 
+    @abstractmethod
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Search several queries with one embedding call and one search call.
+        Returns, per query, (payload, score) hits ranked best first."""
+        pass
+
+    @abstractmethod
+    def embed_query(self, query: str) -> List[float]:
+        """Embedding of a search query, served from the same cache search_batch uses."""
+        pass
+
     @abstractmethod
     def get_stats(self) -> Dict[str, Any]:
         """Return statistics about the database."""
         pass
+
+    @contextmanager
+    def batch_writes(self):
+        """Group many upserts (e.g. one sync) so per-write bookkeeping runs once at the end."""
+        yield
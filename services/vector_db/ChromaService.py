@@ -1,20 +1,18 @@
 from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEndpointEmbeddings
-import os
-import json
-from typing import List, Dict, Any
-from langchain_core.documents import Document
+from typing import List, Dict, Any, Optional, Tuple
 
 from models import Job
-from .AbstractVectorDB import AbstractVectorDB
+from ..cache import TTLCache
+from ..embedders import AbstractEmbedder, HuggingFaceEmbedder
+from .AbstractVectorDB import AbstractVectorDB, build_job_payload, build_job_text
 
 class ChromaService(AbstractVectorDB):
-    def __init__(self,  persist_directory: str = "./data/category-db/chroma_db"):
-        self.model_id = "BAAI/bge-small-en-v1.5"
-
-        self.embd = HuggingFaceEndpointEmbeddings(
-            model=self.model_id,
-            huggingfacehub_api_token=os.getenv('HF_TOKEN'))
+    def __init__(self,  persist_directory: str = "./data/category-db/chroma_db", embedder: Optional[AbstractEmbedder] = None,
+                 query_cache_size: int = 256, result_cache_size: int = 0, cache_ttl: float = 3600):
+        self.embd = embedder or HuggingFaceEmbedder()
+        self.model_id = self.embd.model_id
+        self.query_cache = TTLCache(maxsize=query_cache_size, ttl=cache_ttl)
+        self.result_cache = TTLCache(maxsize=result_cache_size, ttl=cache_ttl)
         
         self.vectorstore = Chroma(
             collection_name="jobs", 
@@ -22,69 +20,113 @@ class ChromaService(AbstractVectorDB):
             persist_directory=persist_directory)
 
     def create_embeddings(self, jobs: List[Dict[str, Any]]) -> List[List[float]]:
-        """Create embeddings using HuggingFace API."""
-        texts = [f"""
-                    {job.get("title", "")}
-                    {job.get("company", "")}
-                    {job.get("description", "")}
-                    {job.get("location", "")}
-                    {job.get("posted_date", "")}
-                    {job.get("url", "")}
-                    {job.get("category", "")}
-                """.strip() for job in jobs]
+        """Create embeddings with the configured embedder."""
+        texts = [build_job_text(job) for job in jobs]
         
         embedding_list = self.embd.embed_documents(texts)
         return embedding_list
     
     def add_jobs(self, jobs: List[Dict[str, Any]]) -> List[str]:
         """Add jobs to vector database"""
-        try:
-            documents = []
-            ids = []
-            for job in jobs:
-                text = f"""
-                        {job.get("title", "")}
-                        {job.get("company", "")}
-                        {job.get("description", "")}
-                        {job.get("location", "")}
-                        {job.get("posted_date", "")}
-                        {job.get("url", "")}
-                        {job.get("category", "")}
-                        """.strip()
-                
-                # Clean metadata
-                metadata = json.loads(json.dumps(job, default=str))
-                metadata.pop('has_embedded', None)
-                metadata.pop('embedded_at', None)
-                
-                document = Document(
-                    page_content=text,
-                    metadata=metadata
-                )
-                
-                job_id = job.get('id') or job.get('job_id')
-                documents.append(document)
-                ids.append(str(job_id) if job_id else None)
-
-            # Add to vector database
-            self.vectorstore.add_documents(documents, ids=ids)
+        if not jobs:
+            return []
 
-            return [i for i in ids if i]
+        try:
+            embeddings = self.create_embeddings(jobs)
+            return self.upsert_embeddings(jobs, embeddings)
         except Exception as e:
             print(f"Error adding jobs: {e}")
             return []
+
+    def upsert_embeddings(self, jobs: List[Dict[str, Any]], embeddings: List[List[float]]) -> List[str]:
+        """Upsert jobs with already computed vectors, bypassing the embedding function."""
+        texts = []
+        metadatas = []
+        vectors = []
+        ids = []
+        for job, vector in zip(jobs, embeddings):
+            job_id = job.get('id') or job.get('job_id')
+            if not job_id:
+                continue
+
+            text = build_job_text(job)
+
+            # Clean metadata: drop tracking fields without a JSON round trip
+            metadata = build_job_payload(job)
+
+            texts.append(text)
+            metadatas.append(metadata)
+            vectors.append(vector)
+            ids.append(str(job_id))
+
+        if ids:
+            self.vectorstore._collection.upsert(
+                ids=ids,
+                embeddings=vectors,
+                documents=texts,
+                metadatas=metadatas
+            )
+            self.result_cache.clear()
+        return ids
         
     def search(self, query: str, n_results: int=10) -> List[Dict[str, Any]]:
         try:
-            results = self.vectorstore.similarity_search(
-                query, 
+            cache_key = (query, n_results)
+            if self.result_cache.maxsize:
+                count = self.vectorstore._collection.count()
+                cached = self.result_cache.get(cache_key)
+                if cached is not None and cached[0] == count:
+                    return list(cached[1])
+
+            query_vector = self._embed_queries([query])[0]
+            results = self.vectorstore.similarity_search_by_vector(
+                query_vector, 
                 k=n_results
             )
-            return [doc.metadata for doc in results]
+            metadatas = [doc.metadata for doc in results]
+            if self.result_cache.maxsize:
+                self.result_cache.set(cache_key, (count, metadatas))
+            return metadatas
         except Exception as e:
             print(f"Search error: {e}")
             return []
         
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Tuple[Dict[str, Any], float]]]:
+        if not queries:
+            return []
+        try:
+            query_vectors = self._embed_queries(queries)
+            # Chroma's native multi-query path: one call for all query embeddings
+            results = self.vectorstore._collection.query(
+                query_embeddings=query_vectors,
+                n_results=k,
+                include=["metadatas", "distances"]
+            )
+            try:
+                relevance = self.vectorstore._select_relevance_score_fn()
+            except ValueError:
+                relevance = lambda distance: 1.0 - distance
+            return [
+                [(metadata, relevance(distance)) for metadata, distance in zip(metadatas, distances)]
+                for metadatas, distances in zip(results["metadatas"], results["distances"])
+            ]
+        except Exception as e:
+            print(f"Batch search error: {e}")
+            return [[] for _ in queries]
+
+    def embed_query(self, query: str) -> List[float]:
+        return self._embed_queries([query])[0]
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Serve query vectors from the cache and embed all misses in one call."""
+        vectors = {query: self.query_cache.get(query) for query in queries}
+        missing = [query for query, vector in vectors.items() if vector is None]
+        if missing:
+            for query, vector in zip(missing, self.embd.embed_queries(missing)):
+                self.query_cache.set(query, vector)
+                vectors[query] = vector
+        return [vectors[query] for query in queries]
+
     def get_stats(self) -> Dict[str, Any]:
         count = self.vectorstore._collection.count()
         return {
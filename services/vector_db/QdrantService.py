@@ -1,19 +1,31 @@
-import os
 import logging
 import uuid
-import json
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, VectorParams, Distance
-from langchain_huggingface import HuggingFaceEndpointEmbeddings
-from .AbstractVectorDB import AbstractVectorDB
+from qdrant_client.models import PointStruct, VectorParams, Distance, QueryRequest
+from ..cache import TTLCache
+from ..embedders import AbstractEmbedder, HuggingFaceEmbedder
+from .AbstractVectorDB import AbstractVectorDB, build_job_payload, build_job_text
+
+# Collection metadata key of the write marker that versions cached search results
+VERSION_KEY = "jobs_version"
 
 class QdrantService(AbstractVectorDB):
-    def __init__(self, API_KEY: str, url: str, local: bool = False):
+    def __init__(self, API_KEY: str, url: str, local: bool = False, embedder: Optional[AbstractEmbedder] = None,
+                 query_cache_size: int = 256, result_cache_size: int = 0, cache_ttl: float = 3600):
         self.logger = logging.getLogger(__name__)
-        self.embedding_model = HuggingFaceEndpointEmbeddings(
-            model='BAAI/bge-small-en-v1.5',
-            huggingfacehub_api_token=os.getenv('HF_TOKEN'))
+        self.embedding_model = embedder or HuggingFaceEmbedder()
+        # Query embeddings never change for a given model, so they only expire by TTL/LRU.
+        # Results are keyed on the collection's write version (see _collection_version).
+        self.query_cache = TTLCache(maxsize=query_cache_size, ttl=cache_ttl)
+        self.result_cache = TTLCache(maxsize=result_cache_size, ttl=cache_ttl)
+        self._version_cache = TTLCache(maxsize=1, ttl=30)
+        # Writers bump the marker even without a result cache of their own: readers elsewhere rely on it
+        self._versioned = True
+        # Inside batch_writes() the marker is bumped once when the block exits
+        self._write_depth = 0
+        self._pending_bump = False
         
         if local:
             self.client = QdrantClient(url=url)
@@ -28,19 +40,11 @@ class QdrantService(AbstractVectorDB):
         if not self.client.collection_exists('job_collection'):
             self.client.create_collection(
                 collection_name='job_collection',
-                vectors_config=VectorParams(size=384, distance=Distance.COSINE) 
+                vectors_config=VectorParams(size=self.embedding_model.dimension, distance=Distance.COSINE)
             )
 
     def create_embeddings(self, jobs: List[Dict[str, Any]]) -> List[List[float]]:
-        jobs_to_embed = [f"""
-                    {job.get("title", "")}
-                    {job.get("company", "")}
-                    {job.get("description", "")}
-                    {job.get("location", "")}
-                    {job.get("posted_date", "")}
-                    {job.get("url", "")}
-                    {job.get("category", "")}
-                        """.strip() for job in jobs]
+        jobs_to_embed = [build_job_text(job) for job in jobs]
                         
         embedding_list = self.embedding_model.embed_documents(jobs_to_embed)
         self.logger.info(f"Generated {len(embedding_list)} embeddings")
@@ -53,54 +57,173 @@ class QdrantService(AbstractVectorDB):
             
         try:
             embeddings = self.create_embeddings(jobs)
-            points = []
-            success_ids = []
-            for i, (job, vector) in enumerate(zip(jobs, embeddings)):
-                # Handle UUID conversion from hex string if possible, else use URL hash or random
-                try:
-                    point_id = str(uuid.UUID(hex=job["id"][:32])) if "id" in job else str(uuid.uuid4())
-                except (ValueError, KeyError):
-                    job_url = job.get('url', '')
-                    point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, str(job_url))) if job_url else str(uuid.uuid4())
-                
-                # Clean payload: remove tracking fields
-                payload = json.loads(json.dumps(job, default=str))
-                payload.pop('has_embedded', None)
-                payload.pop('embedded_at', None)
-                
-                points.append(PointStruct(
-                    id=point_id,
-                    vector=vector,
-                    payload=payload
-                ))
-                if "id" in job:
-                    success_ids.append(job["id"])
-            
-            self.client.upsert(
-                collection_name='job_collection',
-                wait=True,
-                points=points
-            )
-            self.logger.info(f"Successfully upserted {len(points)} jobs")
-            return success_ids
+            return self.upsert_embeddings(jobs, embeddings)
         except Exception as e:
             self.logger.error(f"Error in add_jobs: {e}")
             return []
 
+    def upsert_embeddings(self, jobs: List[Dict[str, Any]], embeddings: List[List[float]]) -> List[str]:
+        """Upsert jobs with already computed vectors. Returns list of IDs."""
+        points = []
+        success_ids = []
+        for job, vector in zip(jobs, embeddings):
+            # Handle UUID conversion from hex string if possible, else use URL hash or random
+            try:
+                point_id = str(uuid.UUID(hex=job["id"][:32])) if "id" in job else str(uuid.uuid4())
+            except (ValueError, KeyError):
+                job_url = job.get('url', '')
+                point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, str(job_url))) if job_url else str(uuid.uuid4())
+            
+            # Clean payload: drop tracking fields without a JSON round trip
+            payload = build_job_payload(job)
+            
+            points.append(PointStruct(
+                id=point_id,
+                vector=vector,
+                payload=payload
+            ))
+            if "id" in job:
+                success_ids.append(job["id"])
+        
+        self.client.upsert(
+            collection_name='job_collection',
+            wait=True,
+            points=points
+        )
+        self.logger.info(f"Successfully upserted {len(points)} jobs")
+        self._written()
+        return success_ids
+
+    def set_categories(self, point_ids_by_category: Dict[str, List[Any]], batch_size: int = 1000) -> int:
+        """Overwrite the category in the payload of existing points, keeping their vectors. Returns points updated."""
+        updated = 0
+        for category, point_ids in point_ids_by_category.items():
+            for start in range(0, len(point_ids), batch_size):
+                batch = point_ids[start:start + batch_size]
+                self.client.set_payload(
+                    collection_name='job_collection',
+                    payload={"category": category},
+                    points=batch,
+                    wait=True
+                )
+                updated += len(batch)
+        if updated:
+            self._written()
+        return updated
+
     def search(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         try:
-            query_vector = self.embedding_model.embed_query(query)
+            version = self._collection_version() if self.result_cache.maxsize else None
+            cache_key = (version, query, n_results)
+            if version is not None:
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    return list(cached)
+
+            query_vector = self.embed_query(query)
             results = self.client.query_points(
                 collection_name='job_collection',
                 query=query_vector,
                 limit=n_results
             ).points
             
-            return [hit.payload for hit in results]
+            payloads = [hit.payload for hit in results]
+            if version is not None:
+                self.result_cache.set(cache_key, payloads)
+            return payloads
         except Exception as e:
             self.logger.error(f"Search error: {e}")
             return []
 
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Tuple[Dict[str, Any], float]]]:
+        if not queries:
+            return []
+        try:
+            query_vectors = self._embed_queries(queries)
+            responses = self.client.query_batch_points(
+                collection_name='job_collection',
+                requests=[
+                    QueryRequest(query=query_vector, limit=k, with_payload=True)
+                    for query_vector in query_vectors
+                ]
+            )
+            return [[(hit.payload, hit.score) for hit in response.points] for response in responses]
+        except Exception as e:
+            self.logger.error(f"Batch search error: {e}")
+            return [[] for _ in queries]
+
+    def embed_query(self, query: str) -> List[float]:
+        return self._embed_queries([query])[0]
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Serve query vectors from the cache and embed all misses in one call."""
+        vectors = {query: self.query_cache.get(query) for query in queries}
+        missing = [query for query, vector in vectors.items() if vector is None]
+        if missing:
+            for query, vector in zip(missing, self.embedding_model.embed_queries(missing)):
+                self.query_cache.set(query, vector)
+                vectors[query] = vector
+        return [vectors[query] for query in queries]
+
+    def _collection_version(self) -> Optional[str]:
+        """
+        Write marker kept in the collection metadata, re-read at most every 30s.
+        Every write through this service replaces it, so in-place updates that keep
+        the point count (re-embeds, relabelled payloads) also retire cached results.
+        None when the marker is missing or cannot be read; results are then not cached.
+        """
+        if not self._versioned:
+            return None
+        version = self._version_cache.get('job_collection')
+        if version is None:
+            try:
+                metadata = self.client.get_collection('job_collection').config.metadata or {}
+            except Exception as e:
+                self.logger.warning(f"Could not read the collection version: {e}")
+                return None
+            version = metadata.get(VERSION_KEY)
+            if version is None:
+                # No write through this service yet: nothing to key results on
+                return None
+            self._version_cache.set('job_collection', version)
+        return version
+
+    @contextmanager
+    def batch_writes(self):
+        self._write_depth += 1
+        try:
+            yield
+        finally:
+            self._write_depth -= 1
+            if not self._write_depth and self._pending_bump:
+                self._pending_bump = False
+                self._bump_version()
+
+    def _written(self):
+        if self._write_depth:
+            # Stale local results go now; other processes learn of the write when the block exits
+            self.result_cache.clear()
+            self._pending_bump = True
+        else:
+            self._bump_version()
+
+    def _bump_version(self) -> Optional[str]:
+        """Retire cached results after a write, here at once and in other processes within 30s."""
+        self.result_cache.clear()
+        self._version_cache.clear()
+        if not self._versioned:
+            return None
+        # A fresh random marker rather than a counter: concurrent writers need no read-modify-write
+        version = uuid.uuid4().hex
+        try:
+            self.client.update_collection('job_collection', metadata={VERSION_KEY: version})
+        except Exception as e:
+            self.logger.warning(f"Server has no collection metadata, result caching is off: {e}")
+            self._versioned = False
+            return None
+        self._version_cache.set('job_collection', version)
+        return version
+
     def get_stats(self) -> Dict[str, Any]:
         try:
             collection_info = self.client.get_collection('job_collection')
@@ -1,5 +1,5 @@
-from .AbstractVectorDB import AbstractVectorDB
+from .AbstractVectorDB import AbstractVectorDB, build_job_payload, build_job_text
 from .QdrantService import QdrantService
 from .ChromaService import ChromaService
 
-__all__ = ["AbstractVectorDB", "QdrantService", "ChromaService"]
+__all__ = ["AbstractVectorDB", "build_job_payload", "build_job_text", "QdrantService", "ChromaService"]
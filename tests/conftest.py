@@ -0,0 +1,26 @@
+import json
+import os
+
+import pytest
+
+from database import Database
+from utils import clean_text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="session")
+def raw_jobs():
+    """jobs.json as scraped: RemoteOK descriptions are still HTML."""
+    with open(os.path.join(ROOT, "jobs.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.fixture(scope="session")
+def jobs(raw_jobs):
+    """jobs.json with cleaned descriptions, as they are stored."""
+    return [dict(job, description=clean_text(job["description"] or "")) for job in raw_jobs]
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "jobs.db"))
+    yield database
+    database.close()
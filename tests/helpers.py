@@ -0,0 +1,159 @@
+"""
+Fakes and local HTTP stubs shared by the tests.
+Nothing here talks to the network: servers bind to 127.0.0.1 on a free port.
+"""
+import json
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+SAMPLE_JOBS = [
+    {"id": "1", "title": "Data Engineer", "company": "Acme", "location": "Remote",
+     "url": "https://example.com/1", "description": "Build pipelines with Python and SQL."},
+    {"id": "2", "title": "Analytics Engineer", "company": "Globex", "location": "EU",
+     "url": "https://example.com/2", "description": "Model data."},
+]
+
+@contextmanager
+def serve(handler) -> Iterator[str]:
+    """Run a request handler class on a background thread; yields its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def chat_chunk(token: str, model: str = "fake", finish_reason: Optional[str] = None) -> bytes:
+    """One server-sent event of an OpenAI-compatible streaming chat completion."""
+    chunk = {"id": "fake", "object": "chat.completion.chunk", "created": 0, "model": model,
+             "choices": [{"index": 0, "delta": {"role": "assistant", "content": token},
+                          "finish_reason": finish_reason}]}
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+class FakeInferenceServer:
+    """
+    OpenAI-compatible chat endpoint that streams `tokens`, one every `delay` seconds.
+    Set `status` to answer with an error instead; request bodies are kept in `requests`.
+    Use as a context manager; `base_url` is what InferenceClient expects.
+    """
+    def __init__(self, tokens: List[str], delay: float = 0.0):
+        self.tokens = tokens
+        self.delay = delay
+        self.status = 200
+        self.requests: List[Dict] = []
+        self.base_url = None
+        self._serving = None
+
+    def __enter__(self) -> "FakeInferenceServer":
+        self._serving = serve(self._handler())
+        self.base_url = self._serving.__enter__() + "/v1"
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._serving.__exit__(*exc_info)
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.requests.append(body)
+                if fake.status != 200:
+                    self.send_response(fake.status)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                try:
+                    for index, token in enumerate(fake.tokens):
+                        time.sleep(fake.delay)
+                        last = index == len(fake.tokens) - 1
+                        self.wfile.write(chat_chunk(token, body["model"], "stop" if last else None))
+                        self.wfile.flush()
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on the stream (deadline or early stop)
+                    pass
+
+            def log_message(self, *args):
+                pass
+        return Handler
+
+class FakeChatClient:
+    """InferenceClient stand-in: chat.completions.create(stream=True) yields `tokens`, counting calls."""
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, max_tokens, stream):
+        self.calls += 1
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+                     for token in self.tokens])
+
+class FakeEmbedder:
+    """Hashed bag of words, so texts with the same words embed identically; counts query and document calls."""
+    model_id = "fake-bow"
+    dimension = 64
+
+    def __init__(self):
+        self.calls = 0
+        self.documents = 0
+
+    def vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for word in text.lower().split():
+            vector[zlib.crc32(word.strip(".,!?").encode()) % self.dimension] += 1.0
+        return vector
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        return self.vector(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.documents += len(texts)
+        return [self.vector(text) for text in texts]
+
+class FakeVectorDB:
+    """
+    Vector store stand-in that returns `jobs` for every query after `delay` seconds.
+    Query vectors are cached per query like the real stores do, and the start time of
+    each search (relative to construction) is kept in `started`.
+    """
+    def __init__(self, jobs: Optional[List[Dict]] = None, delay: float = 0.0):
+        self.jobs = list(SAMPLE_JOBS if jobs is None else jobs)
+        self.delay = delay
+        self.embedder = FakeEmbedder()
+        self.query_cache: Dict[str, List[float]] = {}
+        self.started: Dict[str, float] = {}
+        self.origin = time.perf_counter()
+
+    def hits(self, query: str, k: int):
+        return [(job, 0.8 - rank / 100) for rank, job in enumerate(self.jobs[:k])]
+
+    def search(self, query: str, n_results: int = 5):
+        return [payload for payload, _ in self.search_batch([query], n_results)[0]]
+
+    def search_batch(self, queries: List[str], k: int = 5):
+        for query in queries:
+            self.started[query] = time.perf_counter() - self.origin
+            self.embed_query(query)
+        time.sleep(self.delay)
+        return [self.hits(query, k) for query in queries]
+
+    def embed_query(self, query: str) -> List[float]:
+        if query not in self.query_cache:
+            self.query_cache[query] = self.embedder.embed_query(query)
+        return self.query_cache[query]
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+from huggingface_hub import AsyncInferenceClient
+
+from RAG import RAGFusionStrategy
+from RAG.RAGFusionStrategy import QueryStreamParser
+from tests.helpers import FakeInferenceServer, FakeVectorDB
+
+QUERIES = ["golang backend", "go developer", "remote golang", "senior go engineer", "go microservices"]
+# The generated list streams one item per token
+TOKENS = ["["] + [f'"{query}"' + (", " if i < len(QUERIES) - 1 else "") for i, query in enumerate(QUERIES)] + ["]"]
+TOKEN_DELAY = 0.1
+SEARCH_DELAY = 0.3
+
+class QueryEchoVectorDB(FakeVectorDB):
+    """Every hit is titled with the query that found it."""
+    def hits(self, query, k):
+        return [({"id": f"{query}-{rank}", "title": query}, 1.0 - rank / 10) for rank in range(k)]
+
+@pytest.fixture
+def server():
+    with FakeInferenceServer(TOKENS, delay=TOKEN_DELAY) as fake:
+        yield fake
+
+class FailingQueryVectorDB(QueryEchoVectorDB):
+    """Search for `failing` raises."""
+    failing = QUERIES[1]
+
+    def hits(self, query, k):
+        if query == self.failing:
+            raise RuntimeError("search failed")
+        return super().hits(query, k)
+
+def fusion(server, deadline, **kwargs):
+    return RAGFusionStrategy(client_factory=lambda: AsyncInferenceClient(base_url=server.base_url, api_key="fake"),
+                             deadline=deadline, **kwargs)
+
+def run(strategy, query="golang", vector_db_class=QueryEchoVectorDB):
+    vector_db = vector_db_class(delay=SEARCH_DELAY)
+    started = time.perf_counter()
+    docs = strategy.retrieve(query, vector_db, k=5)
+    return docs, vector_db.started, time.perf_counter() - started
+
+def test_parser_completes_list_items_at_their_closing_quote():
+    parser = QueryStreamParser()
+    streamed = [query for piece in ['```python\n["a b", ', '"c\\"d", \'e\'', ']\n```'] for query in parser.feed(piece)]
+    assert streamed + parser.close() == ["a b", 'c"d', "e"]
+
+def test_parser_reads_numbered_lines_and_skips_lead_ins():
+    parser = QueryStreamParser()
+    assert parser.feed("Here are queries:\n1. go jobs\n- rust jobs\nlast") + parser.close() == [
+        "go jobs", "rust jobs", "last"]
+
+def test_searches_overlap_generation(server):
+    docs, started, elapsed = run(fusion(server, deadline=4.0))
+    last_query_at = TOKEN_DELAY * (len(QUERIES) + 1)
+
+    assert started["golang"] < 0.05
+    assert set(QUERIES) <= set(started)
+    assert started[QUERIES[0]] < last_query_at - TOKEN_DELAY
+    assert {doc["title"] for doc in docs} <= set(QUERIES) | {"golang"} and len(docs) == 5
+    # Fused one search after the last query streamed, not after generation plus all searches
+    assert elapsed < last_query_at + SEARCH_DELAY + 0.1
+
+def test_slow_generation_is_cut_off_at_the_deadline(server):
+    server.delay = TOKEN_DELAY * 10
+    docs, _, elapsed = run(fusion(server, deadline=0.6))
+    assert elapsed < 0.6 + 0.2
+    assert [doc["title"] for doc in docs] == ["golang"] * 5
+
+def test_failed_generation_falls_back_to_the_plain_query(server):
+    server.status = 500
+    docs, _, elapsed = run(fusion(server, deadline=4.0))
+    assert [doc["title"] for doc in docs] == ["golang"] * 5
+    assert elapsed < 1.0
+
+def test_weights_stay_with_their_query_when_a_search_fails(server):
+    # Only the third generated query counts; the second one's search fails
+    weights = [0.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+    docs, _, _ = run(fusion(server, deadline=4.0, weights=weights), vector_db_class=FailingQueryVectorDB)
+    assert [doc["title"] for doc in docs] == [QUERIES[2]] * 5
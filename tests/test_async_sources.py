@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from adapters.remoteOK_adapter import RemoteOKAdapter
+from scraper.base import PaginatedScraper
+from scraper.pipeline import run_ingest
+from scraper.registry import SOURCES, register_source
+from tests.helpers import serve
+
+PAGES = 4
+PAGE_SIZE = 25
+PAGE_DELAY = 0.2
+FEED_DELAY = 0.8
+CHUNKSIZE = 16
+
+def posting(job_id):
+    return {"id": str(job_id), "epoch": job_id, "position": f"Python Engineer {job_id}", "company": "Acme",
+            "description": f"<p>Build <b>data pipelines</b> #{job_id}</p>", "url": f"https://example.com/{job_id}"}
+
+class BoardState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.failed_once = False
+
+def make_board_handler(state):
+    """Slow paginated board that fails its first request and tracks concurrent requests."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with state.lock:
+                state.active += 1
+                state.peak = max(state.peak, state.active)
+                fail = not state.failed_once
+                state.failed_once = True
+            try:
+                time.sleep(PAGE_DELAY)
+                if fail:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                page = int(parse_qs(urlsplit(self.path).query).get("page", ["1"])[0])
+                start = 1000 + (page - 1) * PAGE_SIZE
+                body = json.dumps({
+                    "jobs": [posting(job_id) for job_id in range(start, start + PAGE_SIZE)],
+                    "next_page": page + 1 if page < PAGES else None,
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with state.lock:
+                    state.active -= 1
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+class RemoteOKFeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(FEED_DELAY)
+        body = json.dumps([{"legal": "API terms"}] + [posting(job_id) for job_id in range(1, 51)]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class StubBoardScraper(PaginatedScraper):
+    """Page-numbered board: {"jobs": [...], "next_page": n | null}."""
+    def __init__(self, url):
+        self.url = url
+
+    def first_request(self):
+        return self.url, {"page": 1}
+
+    def parse_page(self, payload, request):
+        next_page = payload.get("next_page")
+        return payload["jobs"], (self.url, {"page": next_page}) if next_page else None
+
+@pytest.fixture(scope="module")
+def stub_board():
+    register_source("stub-board", StubBoardScraper, RemoteOKAdapter)
+    yield "stub-board"
+    SOURCES.pop("stub-board")
+
+@pytest.fixture(scope="module")
+def ingest(stub_board):
+    """Both sources ingested once: (results, board state, elapsed seconds)."""
+    state = BoardState()
+    with serve(make_board_handler(state)) as board_url, serve(RemoteOKFeedHandler) as feed_url:
+        started = time.perf_counter()
+        results = run_ingest(
+            ["remoteok", stub_board],
+            scraper_kwargs={"remoteok": {"url": f"{feed_url}/api"}, stub_board: {"url": f"{board_url}/jobs"}},
+            fetcher_kwargs={"per_host_limit": 1, "backoff_base": 0.05},
+            processes=2,
+            chunksize=CHUNKSIZE,
+        )
+        return results, state, time.perf_counter() - started
+
+def test_single_page_feed_is_transformed_in_order(ingest):
+    results, _, _ = ingest
+    feed = results["remoteok"]
+    # One page, split into chunks across the pool; the legal notice is dropped
+    assert feed.pages == 1 and feed.raw_jobs > CHUNKSIZE
+    assert [job.title for job in feed.transform.jobs] == [f"Python Engineer {job_id}" for job_id in range(1, 51)]
+
+def test_paginated_board_is_fetched_in_order(ingest):
+    results, _, _ = ingest
+    board = results["stub-board"]
+    assert board.pages == PAGES
+    assert [job.title for job in board.transform.jobs] == [
+        f"Python Engineer {job_id}" for job_id in range(1000, 1000 + PAGES * PAGE_SIZE)]
+
+def test_transient_errors_are_retried_within_the_host_limit(ingest):
+    results, state, _ = ingest
+    assert results["stub-board"].error is None
+    assert state.peak == 1
+
+def test_sources_are_fetched_concurrently(ingest):
+    _, _, elapsed = ingest
+    # Serial: the remoteok feed, then the failed and PAGES board requests back to back
+    assert elapsed < FEED_DELAY + PAGE_DELAY * (1 + PAGES)
+
+def test_unreachable_source_reports_an_error(stub_board):
+    results = run_ingest(
+        [stub_board],
+        scraper_kwargs={stub_board: {"url": "http://127.0.0.1:9/jobs"}},
+        fetcher_kwargs={"max_retries": 1, "backoff_base": 0.01, "timeout": 2},
+        processes=1,
+    )
+    assert results[stub_board].error is not None
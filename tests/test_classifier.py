@@ -0,0 +1,33 @@
+import pytest
+
+from scripts.bench_classifier import legacy_classify_category
+from services.JobClassificationService import KeywordClassifier, classify_category
+
+# Keywords named in the plural, which the substring classifier found. The neutral
+# title keeps its "r " keyword from matching the title/description seam.
+PLURAL_JOBS = [
+    ("Specialist", "You will own our batch pipelines."),
+    ("Specialist", "Own the company data warehouses."),
+    ("Specialist", "Run experiments to guide the product."),
+    ("Specialist", "Operate our Kubernetes clusters and zero-downtime deployments."),
+    ("Specialist", "Own the REST backends."),
+    ("Specialist", "Review infrastructures with the platform team."),
+    ("Specialist", "Schedule shifts for nurses and therapists."),
+    ("Specialist", "Work with product managers weekly."),
+    ("Specialist", "Prepare taxes and monthly payrolls."),
+    ("Specialist", "Deploy LLMs behind an API."),
+]
+
+@pytest.mark.parametrize("title, description", PLURAL_JOBS)
+def test_plural_keywords_match_like_the_substring_classifier(title, description):
+    label = KeywordClassifier().classify(title, description)
+    assert label != "Other"
+    assert label == legacy_classify_category(title, description)
+
+def test_keywords_respect_word_boundaries():
+    assert classify_category("Office Assistant", "Maintain the calendar.") == "Other"
+
+def test_title_matches_outweigh_description_matches():
+    # Without the boost these tie and the earlier category (Data Engineer) wins
+    assert classify_category("React Developer", "Work next to our Spark team.") == "Frontend/Full Stack Engineer"
+    assert classify_category("Kubernetes Engineer", "Some Airflow on the side.") == "DevOps/SRE"
@@ -0,0 +1,50 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from scripts.bench_clean_text import reference_clean_text
+from utils import _parse_text, clean_text, clean_texts, html_to_text
+
+MARKUP = [
+    # Whitespace-only strings between tags collapse to one '\n' or ' '
+    "<p>a</p>\n\n<p>b</p>",
+    "<p>a</p>   <p>b</p>",
+    "<p>a</p> \r\n <p>b</p>",
+    "   ",
+    "<b>x</b>&#13;<b>y</b>",
+    # ... except inside <pre> and <textarea>, until the tag that opened them is closed
+    "<pre><p>a</p>  <p>b</p></pre> <p>c</p>",
+    "<textarea>  <b>x</b>  </textarea>",
+    "<pre>a</textarea>\t</pre>\t",
+    "<div><pre>a</div>\t<p>b</p>",
+    # Only references BeautifulSoup knows are decoded
+    "R&D &notes",
+    "&not;es &amp;amp; &lt<b>x</b>",
+    "&a.b; &AMP &ampx",
+    "&#39;s &#x27;s &#128; &#0; &#x110000;",
+    "x&#39 y &#65a; &#; &#xZ",
+    "R&D",
+    "R&amp;",
+    # Markup the regex path hands to the parser
+    "<script>a<script></script> b",
+    "<br>a</br>b<p>c",
+    "<template>&#</template>\nx",
+]
+
+@pytest.mark.parametrize("markup", MARKUP)
+def test_html_to_text_matches_get_text(markup):
+    expected = BeautifulSoup(markup, "html.parser").get_text("|")
+    assert html_to_text(markup, "|") == expected
+    assert _parse_text(markup, "|") == expected
+
+def test_matches_the_beautifulsoup_output(raw_jobs):
+    descriptions = [job.get("description", "") for job in raw_jobs]
+    mismatches = [i for i, text in enumerate(descriptions) if clean_text(text) != reference_clean_text(text)]
+    assert mismatches == []
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_batch_cleaning_matches_one_by_one(raw_jobs, processes):
+    descriptions = [job.get("description", "") for job in raw_jobs]
+    assert clean_texts(descriptions, processes=processes) == [clean_text(text) for text in descriptions]
+
+def test_empty_input():
+    assert clean_text(None) == clean_text("") == ""
@@ -0,0 +1,75 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from models import JobRecord
+from services.export_service import ExportService
+
+def record(job_id, scraped_at=None):
+    return JobRecord(id=job_id, title=f"Engineer {job_id}", company="Acme", description="Build things",
+                     url=f"https://example.com/{job_id}", scraped_at=scraped_at or datetime.now().isoformat())
+
+def exported_ids(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line)["id"] for line in f]
+
+@pytest.fixture
+def exporter(db):
+    db.insert_jobs_bulk(record(job_id) for job_id in ["1", "2", "3"])
+    return ExportService(db, chunk_size=2)
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "exports")
+
+def test_first_run_exports_every_row(exporter, directory):
+    stats = exporter.export_incremental("daily", directory)
+    assert sorted(exported_ids(stats["path"])) == ["1", "2", "3"]
+    assert os.listdir(directory) == [os.path.basename(stats["path"])]
+
+def test_row_committed_after_the_read_is_exported_next_run(db, exporter, directory):
+    # Stamped before the first run reads, but only committed once it is done
+    late = record("late")
+    exporter.export_incremental("daily", directory)
+    db.insert_jobs_bulk([late])
+
+    stats = exporter.export_incremental("daily", directory)
+    assert exported_ids(stats["path"]) == ["late"]
+
+def test_rerun_without_changes_writes_nothing(db, exporter, directory):
+    first = exporter.export_incremental("daily", directory)
+    watermark = db.get_export_watermark("daily")
+
+    stats = exporter.export_incremental("daily", directory)
+    assert stats["rows"] == 0 and stats["path"] is None
+    assert os.listdir(directory) == [os.path.basename(first["path"])]
+    assert db.get_export_watermark("daily") == watermark
+
+def test_changed_embedded_at_is_exported_again(db, exporter, directory):
+    exporter.export_incremental("daily", directory)
+    db.mark_many_as_embedded(["2"])
+
+    stats = exporter.export_incremental("daily", directory)
+    assert exported_ids(stats["path"]) == ["2"]
+    assert exporter.export_incremental("daily", directory)["path"] is None
+
+def test_failed_write_leaves_no_file_and_keeps_the_watermark(db, exporter, directory, monkeypatch):
+    iter_jobs = db.iter_jobs
+
+    def failing(*args, **kwargs):
+        rows = iter_jobs(*args, **kwargs)
+        yield next(rows)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(db, "iter_jobs", failing)
+    with pytest.raises(OSError):
+        exporter.export_incremental("daily", directory)
+    assert os.listdir(directory) == []
+    assert db.get_export_watermark("daily") is None
+
+    monkeypatch.undo()
+    stats = exporter.export_incremental("daily", directory)
+    assert sorted(exported_ids(stats["path"])) == ["1", "2", "3"]
@@ -0,0 +1,134 @@
+import json
+import os
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from scraper.remoteOK import RemoteOKScraper
+from tests.helpers import serve
+
+LEGAL_NOTICE = {"last_updated": 1700000000, "legal": "API terms"}
+
+def posting(job_id, epoch):
+    return {"id": str(job_id), "epoch": epoch, "position": f"Engineer {job_id}",
+            "company": "Acme", "description": "<p>Build things</p>", "url": f"https://example.com/{job_id}"}
+
+class StubFeed:
+    """RemoteOK API stand-in with ETag / Last-Modified validators and injectable 503s."""
+    def __init__(self):
+        self.jobs = [posting(1, 100), posting(2, 200)]
+        self.version = 1
+        self.requests = []
+        self.fail_next = 0
+
+    @property
+    def etag(self):
+        return f'"feed-v{self.version}"'
+
+    @property
+    def last_modified(self):
+        return f"Mon, 0{self.version} Jan 2024 00:00:00 GMT"
+
+    def update(self, jobs):
+        self.jobs = jobs
+        self.version += 1
+
+def make_handler(feed):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            feed.requests.append(dict(self.headers))
+            if feed.fail_next:
+                feed.fail_next -= 1
+                self.send_response(503)
+                self.end_headers()
+                return
+            if self.headers.get("If-None-Match") == feed.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = json.dumps([LEGAL_NOTICE] + feed.jobs).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", feed.etag)
+            self.send_header("Last-Modified", feed.last_modified)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+@pytest.fixture
+def feed():
+    return StubFeed()
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "state.json")
+
+@pytest.fixture
+def make_scraper(feed, state_path):
+    with serve(make_handler(feed)) as base_url:
+        yield lambda **kwargs: RemoteOKScraper(url=f"{base_url}/api", state_path=state_path, timeout=5,
+                                               backoff_factor=0, **kwargs)
+
+def ids(jobs):
+    return [job["id"] for job in jobs]
+
+def test_first_run_returns_every_posting_after_a_retry(feed, state_path, make_scraper):
+    feed.fail_next = 1
+    scraper = make_scraper()
+    assert ids(scraper.scrape_new_jobs()) == ["1", "2"]
+    assert len(feed.requests) == 2
+    assert not os.path.exists(state_path)
+    scraper.commit_state()
+    assert os.path.exists(state_path)
+
+def test_unchanged_feed_short_circuits_on_304(feed, make_scraper):
+    scraper = make_scraper()
+    scraper.scrape_new_jobs()
+    scraper.commit_state()
+
+    assert make_scraper().scrape_new_jobs() == []
+    assert feed.requests[-1].get("If-None-Match") == feed.etag
+    assert feed.requests[-1].get("If-Modified-Since") == feed.last_modified
+
+def test_changed_feed_returns_only_unseen_ids(feed, make_scraper):
+    scraper = make_scraper()
+    scraper.scrape_new_jobs()
+    scraper.commit_state()
+
+    feed.update([posting(3, 300), posting(2, 200)])
+    assert ids(scraper.scrape_new_jobs()) == ["3"]
+
+def test_uncommitted_scrape_is_replayed(feed, make_scraper):
+    scraper = make_scraper()
+    scraper.scrape_new_jobs()
+    scraper.commit_state()
+
+    feed.update([posting(3, 300), posting(2, 200)])
+    make_scraper().scrape_new_jobs()
+    assert ids(make_scraper().scrape_new_jobs()) == ["3"]
+
+def test_state_keeps_validators_and_seen_ids_only(feed, state_path, make_scraper):
+    scraper = make_scraper()
+    scraper.scrape_new_jobs()
+    scraper.commit_state()
+    feed.update([posting(3, 300), posting(2, 200)])
+    scraper.scrape_new_jobs()
+    scraper.commit_state()
+
+    with open(state_path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state == {"etag": feed.etag, "last_modified": feed.last_modified, "seen_ids": ["1", "2", "3"]}
+
+def test_seen_ids_are_capped_to_the_newest(feed, make_scraper):
+    scraper = make_scraper(max_seen_ids=3)
+    scraper.scrape_new_jobs()
+    scraper.commit_state()
+
+    feed.update([posting(5, 500), posting(4, 400)])
+    assert ids(scraper.scrape_new_jobs()) == ["5", "4"]
+    scraper.commit_state()
+    assert scraper.state["seen_ids"] == ["2", "4", "5"]
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from models import JobRecord
+from RAG import HybridRetrievalStrategy
+from services.KeywordIndex import KeywordIndex, tokenize
+from tests.helpers import FakeVectorDB
+
+KEYWORD_QUERIES = ["golang", "dbt", "kubernetes", "terraform", "snowflake", "Veeam Software", "Ping Identity"]
+DENSE_DELAY = 0.2
+
+def contains(job, query):
+    text = tokenize(" ".join(str(job.get(field) or "") for field in ("title", "company", "description")))
+    return all(term in text for term in tokenize(query))
+
+@pytest.fixture
+def index(tmp_path, jobs):
+    keyword_index = KeywordIndex(str(tmp_path / "keywords.db"))
+    # Two batches, as the embedding sync adds them
+    half = len(jobs) // 2
+    keyword_index.add_jobs(jobs[:half])
+    keyword_index.add_jobs(jobs[half:])
+    yield keyword_index
+    keyword_index.close()
+
+def test_every_job_indexed_once(index, jobs):
+    assert len(index) == len(jobs)
+
+def test_reindexing_replaces_the_job(index, jobs):
+    renamed = dict(jobs[0], title="Zanzibar Platform Engineer")
+    index.add_jobs([renamed])
+    assert len(index) == len(jobs)
+    assert [payload["id"] for payload, _ in index.search("zanzibar", k=5)] == [renamed["id"]]
+
+@pytest.mark.parametrize("query", KEYWORD_QUERIES)
+def test_exact_keywords_rank_matching_jobs_first(index, jobs, query):
+    matching = min(5, sum(contains(job, query) for job in jobs))
+    top = [payload for payload, _ in index.search(query, k=5)[:matching]]
+    assert matching > 0
+    assert len(top) == matching and all(contains(payload, query) for payload in top)
+
+def test_hybrid_surfaces_keyword_matches_the_vectors_missed(index, jobs):
+    # A dense model that misses exact terms: always the same unrelated jobs, after a delay
+    unrelated = [job for job in jobs if not contains(job, "golang")]
+    strategy = HybridRetrievalStrategy(index)
+    started = time.perf_counter()
+    docs = strategy.retrieve("golang", FakeVectorDB(unrelated, delay=DENSE_DELAY), k=5)
+    elapsed = time.perf_counter() - started
+
+    assert len(docs) == 5
+    assert sum(contains(doc, "golang") for doc in docs) == 2
+    assert docs[0]["id"] == unrelated[0]["id"]
+    # The keyword search runs while the vector search is in flight
+    assert elapsed < DENSE_DELAY + 0.05
+
+def test_backfill_adds_only_missing_embedded_jobs(tmp_path, db, jobs):
+    db.insert_jobs_bulk(JobRecord.from_dict(job) for job in jobs)
+    db.mark_many_as_embedded(job["id"] for job in jobs[:200])
+    fresh = KeywordIndex(str(tmp_path / "backfill.db"))
+    fresh.add_jobs(jobs[:10])
+
+    assert fresh.backfill(db, chunk_size=64) == 190
+    assert len(fresh) == 200
+    # Level with the database: no scan at all
+    assert fresh.backfill(db) == 0
+    fresh.close()
@@ -0,0 +1,40 @@
+import time
+
+import pytest
+from huggingface_hub import InferenceClient
+
+from RAG import LLMService, SimpleRetrievalStrategy
+from tests.helpers import FakeInferenceServer, FakeVectorDB
+
+TOKENS = ["Here ", "are ", "two ", "matching ", "jobs", ":\n", "1. ", "**Data Engineer** ", "at ", "Acme"]
+TOKEN_DELAY = 0.05
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeInferenceServer(TOKENS, delay=TOKEN_DELAY) as fake:
+        yield fake
+
+@pytest.fixture
+def llm(server):
+    return LLMService(FakeVectorDB(), SimpleRetrievalStrategy(),
+                      client=InferenceClient(base_url=server.base_url, api_key="fake"))
+
+def test_retrieval_is_available_before_generation(llm, server):
+    response = llm.stream_query("Find me data engineer jobs")
+    assert len(response.docs) == 2
+    assert "retrieve" in response.timings and "first_token" not in response.timings
+    assert server.requests[-1].get("stream") is True
+
+def test_tokens_arrive_incrementally(llm):
+    response = llm.stream_query("Find me data engineer jobs")
+    started = time.perf_counter()
+    arrivals = [time.perf_counter() - started for _ in response]
+
+    assert len(arrivals) == len(TOKENS)
+    assert arrivals[0] < arrivals[-1] / 2
+    assert response.text == "".join(TOKENS)
+    timings = response.timings
+    assert timings["retrieve"] <= timings["prompt"] <= timings["first_token"] <= timings["last_token"]
+
+def test_query_returns_the_full_answer(llm):
+    assert llm.query("anything") == "".join(TOKENS)
@@ -0,0 +1,67 @@
+from models import JobRecord
+from services.NearDuplicateDetector import MinHasher, NearDuplicateDetector, titles_match
+
+def repost(job, word="Hiring"):
+    """The same posting under a new id and URL with one word added, as boards repost."""
+    return dict(job, id=job["id"] + "-repost", url=job["url"] + "-repost",
+                description=f"{word} {job['description']}")
+
+def long_jobs(jobs, count=20):
+    return [job for job in jobs if len(job["description"].split()) > 150][:count]
+
+def test_signature_similarity_tracks_jaccard():
+    hasher = MinHasher()
+    text = " ".join(f"word{i}" for i in range(300))
+    assert MinHasher.similarity(hasher.signature(text), hasher.signature(text)) == 1.0
+    assert MinHasher.similarity(hasher.signature(text), hasher.signature("unrelated text entirely")) < 0.1
+
+def test_titles_match_on_word_containment():
+    assert titles_match("Senior Sales Engineer", "Senior Sales Engineer (Remote)")
+    assert not titles_match("Senior Go Engineer", "Junior Designer")
+
+def test_reposts_of_indexed_jobs_are_duplicates(db, jobs):
+    detector = NearDuplicateDetector(db)
+    originals = long_jobs(jobs)
+    detector.index(detector.deduplicate(originals))
+
+    result = detector.deduplicate([repost(job) for job in originals])
+    assert result.unique == []
+    assert [canonical for _, canonical, _ in result.duplicates] == [job["id"] for job in originals]
+    assert all(similarity >= detector.threshold for _, _, similarity in result.duplicates)
+
+def test_duplicates_within_one_batch_collapse_onto_the_first(db, jobs):
+    detector = NearDuplicateDetector(db)
+    original = long_jobs(jobs, 1)[0]
+    result = detector.deduplicate([original, repost(original)])
+    assert [job["id"] for job in result.unique] == [original["id"]]
+    assert [(job["id"], canonical) for job, canonical, _ in result.duplicates] == [
+        (original["id"] + "-repost", original["id"])]
+
+def test_exact_rescrapes_and_other_titles_stay_unique(db, jobs):
+    detector = NearDuplicateDetector(db)
+    original = long_jobs(jobs, 1)[0]
+    detector.index(detector.deduplicate([original]))
+
+    # Same id: left to INSERT OR IGNORE; other title: a per-level variant on shared boilerplate
+    variant = dict(repost(original), title="Junior Office Manager")
+    result = detector.deduplicate([original, variant])
+    assert [job["id"] for job in result.unique] == [original["id"], variant["id"]]
+    assert result.duplicates == []
+
+def test_index_records_duplicates(db, jobs):
+    detector = NearDuplicateDetector(db)
+    originals = long_jobs(jobs, 5)
+    detector.index(detector.deduplicate(originals))
+    detector.index(detector.deduplicate([repost(job) for job in originals]))
+    assert detector.stats() == {"indexed_jobs": 5, "near_duplicates": 5}
+
+def test_backfill_keeps_the_oldest_posting_canonical(db, jobs):
+    original = long_jobs(jobs, 1)[0]
+    newer = dict(repost(original), scraped_at="2099-01-01T00:00:00")
+    db.insert_jobs_bulk(JobRecord.from_dict(job) for job in [newer, dict(original, scraped_at="2020-01-01T00:00:00")])
+
+    detector = NearDuplicateDetector(db)
+    assert detector.backfill(chunk_size=1) == {"indexed": 1, "duplicates": 1}
+    canonical = db.conn.execute("SELECT canonical_id FROM job_duplicates WHERE job_id = ?", (newer["id"],)).fetchone()
+    assert canonical[0] == original["id"]
+    assert detector.backfill() == {"indexed": 0, "duplicates": 0}
@@ -0,0 +1,74 @@
+import io
+
+import pyarrow.parquet as pq
+import pytest
+
+from models import JobRecord
+from services.parquet_export import JOBS_SCHEMA_FIELDS, _to_utc, arrow_schema, upload_parquet_parts
+
+ROWS_PER_PART = 100
+
+class FakeGCSHook:
+    """Stands in for GCSHook.upload; stores object bytes and the upload calls."""
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+
+    def upload(self, bucket_name, object_name, filename=None, data=None, mime_type=None, chunk_size=None, **kwargs):
+        with open(filename, "rb") as f:
+            self.objects[(bucket_name, object_name)] = f.read()
+        self.calls.append({"object_name": object_name, "mime_type": mime_type, "chunk_size": chunk_size})
+
+    def table(self, object_name, bucket_name="bucket"):
+        return pq.read_table(io.BytesIO(self.objects[(bucket_name, object_name)]))
+
+@pytest.fixture(scope="module")
+def records(raw_jobs):
+    return [JobRecord.from_dict(job) for job in raw_jobs] + [
+        JobRecord(id="missing-url", title="No URL", company="Acme", description="", url=None,
+                  scraped_at="2024-01-01T00:00:00")]
+
+@pytest.fixture(scope="module")
+def uploaded(records):
+    hook = FakeGCSHook()
+    object_names = upload_parquet_parts(records, hook, "bucket", "raw/2024-01-01/jobs",
+                                        rows_per_part=ROWS_PER_PART, row_group_size=64)
+    return hook, object_names
+
+def valid(records):
+    return [record for record in records if record.url]
+
+def test_parts_uploaded_in_order_and_chunked(records, uploaded):
+    hook, object_names = uploaded
+    parts = -(-len(valid(records)) // ROWS_PER_PART)
+    assert object_names == [f"raw/2024-01-01/jobs-{i:05d}.parquet" for i in range(parts)]
+    assert all(call["chunk_size"] for call in hook.calls)
+
+def test_schema_matches_schema_fields(uploaded):
+    hook, object_names = uploaded
+    assert all(hook.table(name).schema.equals(arrow_schema()) for name in object_names)
+
+def test_values_round_trip_and_rows_without_url_are_rejected(records, uploaded):
+    hook, object_names = uploaded
+    rows = [row for name in object_names for row in hook.table(name).to_pylist()]
+    assert [row["id"] for row in rows] == [record.id for record in valid(records)]
+
+    for row, record in zip(rows, valid(records)):
+        expected = record.to_dict()
+        for field in JOBS_SCHEMA_FIELDS:
+            value = expected[field["name"]]
+            if field["type"] == "TIMESTAMP":
+                value = _to_utc(value)
+            assert row[field["name"]] == value, (record.id, field["name"])
+
+def test_parquet_is_smaller_than_ndjson(records, uploaded):
+    hook, object_names = uploaded
+    ndjson_bytes = len("\n".join(record.to_json() for record in valid(records)).encode("utf-8"))
+    assert sum(len(hook.objects[("bucket", name)]) for name in object_names) < ndjson_bytes
+
+def test_empty_batch_uploads_one_empty_part():
+    # The WRITE_TRUNCATE load still needs a source object
+    hook = FakeGCSHook()
+    object_names = upload_parquet_parts([], hook, "bucket", "raw/empty/jobs")
+    assert len(object_names) == 1
+    assert hook.table(object_names[0]).num_rows == 0
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from RAG import ContextBuilder, LLMService, SemanticResponseCache, SimpleRetrievalStrategy
+from tests.helpers import FakeChatClient, FakeEmbedder, FakeVectorDB
+
+TOKENS = ["Here ", "are ", "the ", "jobs", "."]
+ANSWER = "".join(TOKENS)
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "responses.db")
+
+@pytest.fixture
+def client():
+    return FakeChatClient(TOKENS)
+
+@pytest.fixture
+def vector_db():
+    return FakeVectorDB()
+
+@pytest.fixture
+def cache(path):
+    store = SemanticResponseCache(FakeEmbedder(), path=path, threshold=0.95)
+    yield store
+    store.close()
+
+@pytest.fixture
+def llm(vector_db, client, cache):
+    return LLMService(vector_db, SimpleRetrievalStrategy(), client=client, response_cache=cache)
+
+def test_same_question_is_answered_from_the_cache(llm, client):
+    assert llm.query("Find me Data Engineer jobs") == ANSWER and client.calls == 1
+    response = llm.stream_query("find me data engineer jobs!")
+    assert "".join(response) == ANSWER
+    assert response.cached and client.calls == 1
+
+def test_different_question_generates(llm, client):
+    llm.query("Find me Data Engineer jobs")
+    assert not llm.stream_query("Frontend roles in Berlin").cached
+    assert client.calls == 2
+
+def test_unfinished_stream_is_not_stored(llm):
+    llm.stream_query("Frontend roles in Berlin")
+    assert not llm.stream_query("Frontend roles in Berlin").cached
+
+def test_changed_retrieved_jobs_generate_again(llm, vector_db):
+    llm.query("Find me Data Engineer jobs")
+    vector_db.jobs.append({"id": "3", "title": "ML Engineer", "company": "Initech", "location": "US",
+                           "url": "https://example.com/3", "description": "Train models."})
+    assert not llm.stream_query("Find me Data Engineer jobs").cached
+
+def test_lookup_reuses_the_retrieval_embedding(llm, cache, vector_db):
+    for question in ["Find me Data Engineer jobs", "find me data engineer jobs!", "Frontend roles in Berlin"]:
+        llm.query(question)
+    assert cache.embedder.calls == 0
+    assert vector_db.embedder.calls == len(vector_db.query_cache) == 3
+
+def test_passage_scoring_reuses_the_retrieval_embedding(vector_db, client, cache):
+    builder = ContextBuilder(embedder=FakeEmbedder())
+    llm = LLMService(vector_db, SimpleRetrievalStrategy(), client=client, response_cache=cache, context_builder=builder)
+    llm.query("Find me Data Engineer jobs")
+    assert builder.embedder.documents > 0 and builder.embedder.calls == 0
+    assert vector_db.embedder.calls == 1
+
+def test_another_instance_on_the_same_file_hits(llm, vector_db, client, path):
+    llm.query("Find me Data Engineer jobs")
+    other_cache = SemanticResponseCache(FakeEmbedder(), path=path)
+    other = LLMService(vector_db, SimpleRetrievalStrategy(), client=client, response_cache=other_cache)
+    assert other.stream_query("Find me Data Engineer jobs").cached and client.calls == 1
+    other_cache.close()
+
+def test_hit_rate_is_tracked(llm, cache):
+    llm.query("Find me Data Engineer jobs")
+    llm.query("Find me Data Engineer jobs")
+    llm.query("Frontend roles in Berlin")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+    assert stats["hit_rate"] == 1 / 3
+
+def test_entries_expire_after_ttl(tmp_path, vector_db):
+    expiring = SemanticResponseCache(FakeEmbedder(), path=str(tmp_path / "ttl.db"), ttl=0.2)
+    vector, docs_key = expiring.embed("python jobs"), expiring.make_docs_key(vector_db.jobs)
+    expiring.put("python jobs", vector, docs_key, "answer")
+    assert expiring.get(vector, docs_key) == "answer"
+    time.sleep(0.3)
+    assert expiring.get(vector, docs_key) is None
+    expiring.close()
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    small = SemanticResponseCache(FakeEmbedder(), path=str(tmp_path / "lru.db"), max_entries=2)
+    keys = {question: (small.embed(question), small.make_docs_key([{"id": question}]))
+            for question in ["a jobs", "b jobs", "c jobs"]}
+    small.put("a jobs", *keys["a jobs"], "a")
+    small.put("b jobs", *keys["b jobs"], "b")
+    time.sleep(0.01)
+    small.get(*keys["a jobs"])
+    small.put("c jobs", *keys["c jobs"], "c")
+
+    assert small.get(*keys["a jobs"]) == "a"
+    assert small.get(*keys["b jobs"]) is None
+    assert small.get(*keys["c jobs"]) == "c"
+    small.close()